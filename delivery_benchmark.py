@@ -0,0 +1,310 @@
+"""
+Headless benchmarks for the delivery page
+Runs DeliveryView under the offscreen Qt platform against synthetic location
+files and writes the measurements to a JSON file that can be compared between runs.
+
+    python delivery_benchmark.py                        # 10, 1k, 10k and 100k locations
+    python delivery_benchmark.py --sizes 1000 --repeat 50
+    python delivery_benchmark.py --compare old.json     # print ratios against an earlier run
+
+Each size runs in its own subprocess so peak RSS is measured per size.
+When the application's app.core package is not importable, minimal
+theme manager / BaseView doubles stand in for it.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from typing import Any, Callable, Dict, List
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+DEFAULT_SIZES = [10, 1000, 10000, 100000]
+DEFAULT_OUTPUT = "delivery_benchmark.json"
+
+THEMES = [
+    {"frame_color": "#EEEEEE", "white_frame": "#FFFFFF", "button_color": "#2D3E50", "button_hover": "#3D5266",
+     "changing_button_fg": "#27AE60", "grey_font_color": "#7F8C8D", "text_color": "#2C3E50"},
+    {"frame_color": "#1E1E1E", "white_frame": "#2A2A2A", "button_color": "#3A3A3A", "button_hover": "#4A4A4A",
+     "changing_button_fg": "#2ECC71", "grey_font_color": "#AAAAAA", "text_color": "#F0F0F0"},
+]
+
+
+class BenchThemeManager:
+    """IThemeManager double that alternates between two themes"""
+
+    def __init__(self):
+        self.theme_index = 0
+
+    def get_current_theme(self) -> Dict[str, str]:
+        return THEMES[self.theme_index % len(THEMES)]
+
+    def toggle(self) -> None:
+        self.theme_index += 1
+
+
+class BenchAppController:
+    """app_controller double that only records what the view asks of it"""
+
+    def __init__(self):
+        self.calls: List[tuple] = []
+
+    def start_delivery_process(self, delivery_data: Dict[str, Any]) -> None:
+        self.calls.append(("start_delivery_process", delivery_data))
+
+    def show_message(self, message: str, level: str = "info") -> None:
+        self.calls.append(("show_message", message, level))
+
+    def show_home(self) -> None:
+        self.calls.append(("show_home",))
+
+
+def install_app_core_doubles() -> None:
+    """Provide app.core.interfaces / app.core.base_classes when the real app is not on the path"""
+    try:
+        import app.core.interfaces  # noqa: F401
+        import app.core.base_classes  # noqa: F401
+        return
+    except ImportError:
+        pass
+    from PySide6.QtWidgets import QWidget
+
+    class IThemeManager:
+        def get_current_theme(self) -> Dict[str, str]:
+            raise NotImplementedError
+
+    class BaseView(QWidget):
+        def __init__(self, parent=None, **kwargs):
+            QWidget.__init__(self, parent)
+
+        def destroy(self) -> None:
+            self.deleteLater()
+
+    class ThemeableMixin:
+        def __init__(self):
+            self._theme_colors: Dict[str, str] = {}
+
+        def set_theme_colors(self, colors: Dict[str, str]) -> None:
+            self._theme_colors = dict(colors)
+
+        def get_theme_color(self, key: str) -> str:
+            return self._theme_colors.get(key, "#000000")
+
+    modules = {name: types.ModuleType(name) for name in ("app", "app.core", "app.core.interfaces", "app.core.base_classes")}
+    modules["app"].core = modules["app.core"]
+    modules["app.core"].interfaces = modules["app.core.interfaces"]
+    modules["app.core"].base_classes = modules["app.core.base_classes"]
+    modules["app.core.interfaces"].IThemeManager = IThemeManager
+    modules["app.core.base_classes"].BaseView = BaseView
+    modules["app.core.base_classes"].ThemeableMixin = ThemeableMixin
+    sys.modules.update(modules)
+
+
+def write_location_files(directory: str, size: int, seed: int = 1) -> Dict[str, str]:
+    """Write synthetic delivery and base location files with `size` tables"""
+    rng = random.Random(seed)
+    side = max(1.0, size ** 0.5)
+    delivery = {"Delivery_Location": [
+        {"name": f"Table {i + 1}", "cordinates": [round(rng.uniform(0, side), 3), round(rng.uniform(0, side), 3)]}
+        for i in range(size)]}
+    bases = [{"name": f"Base {i + 1}", "cordinates": [round(rng.uniform(0, side), 3), round(rng.uniform(0, side), 3),
+                                                     0.0, 0.0, 0.0, 1.0]}
+             for i in range(20)]
+    returns = {"Base_Locations": bases, "Default_Base_Loc": []}
+    paths = {"delivery": os.path.join(directory, "delivery_location.json"),
+             "return": os.path.join(directory, "event_data.json")}
+    with open(paths["delivery"], "w") as f:
+        json.dump(delivery, f)
+    with open(paths["return"], "w") as f:
+        json.dump(returns, f)
+    return paths
+
+
+def timings(samples: List[float]) -> Dict[str, float]:
+    """Summary statistics (ms) of per-call durations in seconds"""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {"n": len(ordered), "min_ms": ordered[0] * 1e3, "median_ms": statistics.median(ordered) * 1e3,
+            "mean_ms": statistics.fmean(ordered) * 1e3, "p95_ms": p95 * 1e3}
+
+
+def measure(action: Callable[[], None], repeat: int, settle: Callable[[], None]) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        settle()
+        samples.append(time.perf_counter() - start)
+    return timings(samples)
+
+
+def run_size(size: int, repeat: int) -> Dict[str, Any]:
+    """Benchmark one location count in this process"""
+    from PySide6.QtCore import QThreadPool
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    install_app_core_doubles()
+    import delivery_page
+
+    def settle() -> None:
+        app.processEvents()
+
+    def wait_until(condition: Callable[[], bool]) -> None:
+        while not condition():
+            QThreadPool.globalInstance().waitForDone(5)
+            app.processEvents()
+
+    result: Dict[str, Any] = {"size": size}
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_location_files(directory, size)
+        theme_manager, controller = BenchThemeManager(), BenchAppController()
+
+        # Cold construction: parse the JSON, nothing cached
+        repository = delivery_page.LocationRepository(paths["delivery"], paths["return"], watch=False)
+        first_batch: List[float] = []
+        repository.delivery_batch.connect(lambda batch: first_batch or first_batch.append(time.perf_counter()))
+        start = time.perf_counter()
+        view = delivery_page.DeliveryView(None, theme_manager, controller, location_repository=repository)
+        constructed = time.perf_counter()
+        view.resize(1280, 800)
+        view.show()
+        wait_until(lambda: repository.delivery_ready and repository.return_ready)
+        settle()
+        ready = time.perf_counter()
+        result["construction_ms"] = (constructed - start) * 1e3
+        result["first_page_ms"] = ((first_batch[0] if first_batch else ready) - start) * 1e3
+        result["ready_ms"] = (ready - start) * 1e3
+
+        # Construction against an already loaded repository (a page opened again)
+        start = time.perf_counter()
+        second = delivery_page.DeliveryView(None, theme_manager, controller, location_repository=repository)
+        settle()
+        result["reopen_ms"] = (time.perf_counter() - start) * 1e3
+        second.destroy()
+        settle()
+
+        # Warm start: a fresh repository served from the snapshot cache
+        warm_repository = delivery_page.LocationRepository(paths["delivery"], paths["return"], watch=False)
+        start = time.perf_counter()
+        warm = delivery_page.DeliveryView(None, theme_manager, controller, location_repository=warm_repository)
+        wait_until(lambda: warm_repository.delivery_ready and warm_repository.return_ready)
+        result["warm_ready_ms"] = (time.perf_counter() - start) * 1e3
+        warm.destroy()
+        settle()
+
+        pages = max(1, (size + view._buttons_per_page - 1) // view._buttons_per_page)
+
+        def next_page() -> None:
+            if view._current_page + 1 >= pages:
+                view._current_page = -1
+            view._next_page()
+        result["next_page"] = measure(next_page, repeat, settle)
+
+        rng = random.Random(2)
+
+        def click() -> None:
+            view._on_location_click(rng.randrange(size))
+        result["location_click"] = measure(click, repeat, settle)
+
+        def retheme() -> None:
+            theme_manager.toggle()
+            view.update_theme()
+        result["update_theme"] = measure(retheme, max(3, repeat // 4), settle)
+
+        def open_popup() -> None:
+            view._show_base_location_selection()
+        start = time.perf_counter()
+        open_popup()
+        settle()
+        result["popup_first_open_ms"] = (time.perf_counter() - start) * 1e3
+        result["popup_open"] = measure(open_popup, repeat, settle)
+        view.location_popup.hide()
+
+        view.destroy()
+        settle()
+    result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    return result
+
+
+def run_in_subprocess(size: int, repeat: int) -> Dict[str, Any]:
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", str(size), "--repeat", str(repeat)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def environment() -> Dict[str, Any]:
+    import PySide6
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+            "pyside6": PySide6.__version__, "platform": platform.platform(), "qpa": os.environ["QT_QPA_PLATFORM"],
+            "commit": commit}
+
+
+def headline(result: Dict[str, Any]) -> Dict[str, float]:
+    """Flatten one size's results to the single numbers worth comparing"""
+    flat = {}
+    for key, value in result.items():
+        if isinstance(value, dict):
+            flat[f"{key}.median_ms"] = value["median_ms"]
+        elif key != "size":
+            flat[key] = value
+    return flat
+
+
+def compare(current: Dict[str, Any], baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = {str(r["size"]): headline(r) for r in json.load(f)["results"]}
+    for result in current["results"]:
+        before = baseline.get(str(result["size"]))
+        if before is None:
+            continue
+        print(f"\n{result['size']} locations (current / baseline)")
+        for metric, value in headline(result).items():
+            if before.get(metric):
+                print(f"  {metric:28s} {value:10.2f} {value / before[metric]:6.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma separated location counts")
+    parser.add_argument("--repeat", type=int, default=30, help="samples per latency measurement")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="results file to write")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(run_size(args.worker, args.repeat)))
+        return
+
+    results = {"environment": environment(), "repeat": args.repeat, "results": []}
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        result = run_in_subprocess(size, args.repeat)
+        results["results"].append(result)
+        print(f"{size:>7} locations: construct {result['construction_ms']:.1f} ms, "
+              f"first page {result['first_page_ms']:.1f} ms, ready {result['ready_ms']:.1f} ms, "
+              f"next page {result['next_page']['median_ms']:.2f} ms, click {result['location_click']['median_ms']:.2f} ms, "
+              f"theme {result['update_theme']['median_ms']:.2f} ms, popup {result['popup_open']['median_ms']:.2f} ms, "
+              f"peak RSS {result['peak_rss_mb']:.0f} MB")
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
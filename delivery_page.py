@@ -3,25 +3,1882 @@ Delivery view for delivery management
 Following Single Responsibility Principle and MVC pattern
 """
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-QPushButton, QFrame, QGridLayout, QScrollArea, QApplication, QMainWindow, QDialog,
+QPushButton, QFrame, QGridLayout, QScrollArea, QLineEdit, QApplication, QMainWindow, QDialog,
  QMessageBox, QFileDialog, QProgressBar, QSlider, QCheckBox,
   QRadioButton, QGroupBox, QFormLayout, QTabWidget, QSplitter,
    QMenuBar, QMenu, QSizePolicy, QStatusBar, QToolBar)
 from PySide6.QtGui import QAction
 
-from PySide6.QtCore import Qt, QTimer, Signal, QObject, QPropertyAnimation, QEasingCurve, QRect
+from PySide6.QtCore import (Qt, QTimer, Signal, QObject, QPropertyAnimation, QEasingCurve, QRect,
+ QRunnable, QThreadPool, QFileSystemWatcher, QEvent, QSize)
 from PySide6.QtGui import QFont, QPixmap, QPalette, QColor
+import atexit
+import codecs
+import functools
+import hashlib
 import json
+import math
+import mmap
 import os
-from typing import List, Dict, Any, Optional
+import queue
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import deque
+from contextlib import nullcontext
+from heapq import heappush, heapreplace
+from typing import List, Dict, Any, Optional, Callable, Collection, Iterable, Iterator, Tuple
 from app.core.interfaces import IThemeManager
 from app.core.base_classes import BaseView, ThemeableMixin
 
 
+# Instrumentation: DELIVERY_VIEW_PROFILE=1 records timings of startup phases and
+# interaction handlers; a file path instead of 1 also writes a Chrome trace
+# there at exit. When unset, `profiled` returns functions unchanged.
+PROFILE_ENV = "DELIVERY_VIEW_PROFILE"
+
+
+class PerfRecorder:
+    """Ring buffer of timed spans plus named counters
+    
+    Spans are (name, start ns, duration ns, thread id) tuples kept in a
+    bounded deque, so a long session only keeps its most recent activity.
+    Export with `to_json` for a summary or `to_chrome_trace` for
+    chrome://tracing / Perfetto.
+    """
+    
+    def __init__(self, enabled: bool = False, capacity: int = 4096):
+        self.enabled = enabled
+        self._spans: deque = deque(maxlen=capacity)
+        self._counters: Dict[str, int] = {}
+        self._widget_counter: Optional[QObject] = None
+    
+    def record(self, name: str, start_ns: int, duration_ns: int) -> None:
+        self._spans.append((name, start_ns, duration_ns, threading.get_ident()))
+    
+    def span(self, name: str):
+        """Context manager timing the enclosed block"""
+        return _PerfSpan(self, name) if self.enabled else nullcontext()
+    
+    def count(self, name: str, amount: int = 1) -> None:
+        if self.enabled:
+            self._counters[name] = self._counters.get(name, 0) + amount
+    
+    def count_widgets(self) -> None:
+        """Count every widget created in the application from now on"""
+        app = QApplication.instance()
+        if self.enabled and app is not None and self._widget_counter is None:
+            self._widget_counter = _WidgetCounter(self, app)
+            app.installEventFilter(self._widget_counter)
+    
+    def clear(self) -> None:
+        self._spans.clear()
+        self._counters.clear()
+    
+    def spans(self) -> List[Tuple[str, int, int, int]]:
+        return list(self._spans)
+    
+    def counters(self) -> Dict[str, int]:
+        return dict(self._counters)
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Call count, total and worst time (ms) per span name"""
+        result: Dict[str, Dict[str, float]] = {}
+        for name, _, duration_ns, _ in self._spans:
+            entry = result.setdefault(name, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["calls"] += 1
+            entry["total_ms"] += duration_ns / 1e6
+            entry["max_ms"] = max(entry["max_ms"], duration_ns / 1e6)
+        return result
+    
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "spans": [{"name": name, "start_us": start_ns / 1e3, "duration_us": duration_ns / 1e3, "thread": thread}
+                      for name, start_ns, duration_ns, thread in self._spans],
+            "counters": self.counters(),
+            "summary": self.summary(),
+        }
+    
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        pid = os.getpid()
+        events = [{"name": name, "ph": "X", "ts": start_ns / 1e3, "dur": duration_ns / 1e3, "pid": pid, "tid": thread}
+                  for name, start_ns, duration_ns, thread in self._spans]
+        if self._counters:
+            end_us = max((start_ns + duration_ns for _, start_ns, duration_ns, _ in self._spans), default=0) / 1e3
+            events.append({"name": "counters", "ph": "C", "ts": end_us, "pid": pid, "args": self.counters()})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+    
+    def export(self, path: str, chrome_trace: bool = True) -> None:
+        """Write the recording to `path` as a Chrome trace or as the JSON summary"""
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace() if chrome_trace else self.to_json(), f)
+
+
+class _PerfSpan:
+    __slots__ = ("_recorder", "_name", "_start")
+    
+    def __init__(self, recorder: PerfRecorder, name: str):
+        self._recorder = recorder
+        self._name = name
+    
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self._recorder.record(self._name, self._start, time.perf_counter_ns() - self._start)
+
+
+class _WidgetCounter(QObject):
+    """Application event filter counting widgets as they get a parent"""
+    
+    def __init__(self, recorder: PerfRecorder, parent: QObject):
+        super().__init__(parent)
+        self._recorder = recorder
+    
+    def eventFilter(self, watched, event) -> bool:
+        if event.type() == QEvent.ChildAdded and event.child().isWidgetType():
+            self._recorder.count("widgets_created")
+        return False
+
+
+def _profile_setting() -> str:
+    value = os.environ.get(PROFILE_ENV, "").strip()
+    return "" if value.lower() in ("", "0", "false", "no", "off") else value
+
+
+PROFILER = PerfRecorder(enabled=bool(_profile_setting()))
+if PROFILER.enabled and _profile_setting() != "1":
+    atexit.register(PROFILER.export, _profile_setting())
+
+
+def profiled(name: Optional[str] = None):
+    """Decorator timing each call into PROFILER; a no-op unless profiling was enabled at import"""
+    def decorate(func):
+        if not PROFILER.enabled:
+            return func
+        label = name or func.__qualname__
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                PROFILER.record(label, start, time.perf_counter_ns() - start)
+        return wrapper
+    return decorate
+
+
+class LocationLoaderSignals(QObject):
+    """Signals used by location loaders to hand parsed data back to the GUI thread"""
+    loaded = Signal(str, object)       # (key, parsed JSON or None if the file is missing)
+    chunk = Signal(str, int, object)   # (key, request id, LocationStore batch of streamed locations)
+    failed = Signal(str, int, str)     # (key, request id or 0 if untracked, error message)
+
+
+class LocationFileLoader(QRunnable):
+    """Parse a location JSON file on a QThreadPool worker thread
+    
+    An optional `prepare` callable also runs on the worker thread and turns the
+    parsed JSON (or None for a missing file) into whatever the view applies.
+    An optional `read` callable replaces the plain JSON parse, taking the path
+    and returning the data (e.g. to go through a snapshot cache).
+    """
+    
+    def __init__(self, key: str, path: str, signals: LocationLoaderSignals,
+                 prepare: Optional[Callable[[Any], Any]] = None,
+                 read: Optional[Callable[[str], Any]] = None):
+        super().__init__()
+        self._key = key
+        self._path = path
+        self._signals = signals
+        self._prepare = prepare
+        self._read = read
+    
+    @profiled()
+    def run(self) -> None:
+        """Read and parse the file, then emit the result"""
+        try:
+            data = None
+            if self._read is not None:
+                data = self._read(self._path)
+            elif os.path.exists(self._path):
+                with open(self._path, "r") as f:
+                    data = json.load(f)
+            if self._prepare is not None:
+                data = self._prepare(data)
+            self._signals.loaded.emit(self._key, data)
+        except RuntimeError:
+            # The receiving view was destroyed while we were parsing
+            pass
+        except Exception as e:
+            try:
+                self._signals.failed.emit(self._key, 0, str(e))
+            except RuntimeError:
+                pass
+
+
+class LocationStore:
+    """Compact, columnar store of named locations.
+    
+    Names are interned strings and coordinates live in one flat array('d')
+    with a fixed number of values per location (2 for delivery points, 6 for
+    base poses), so a location costs a name reference and a few raw doubles
+    instead of a dict and a list of float objects. Locations are addressed by
+    integer id (their insertion position). Views only read from a store, so
+    one instance can be shared by any number of them without copying.
+    """
+    
+    def __init__(self, stride: int):
+        self._stride = stride
+        self._names: List[str] = []
+        self._cordinates = array('d')
+        self._lengths = array('B')  # values actually given per location (0 = no coordinates)
+    
+    @classmethod
+    def from_locations(cls, locations: Iterable[Dict[str, Any]], stride: int) -> "LocationStore":
+        """Build a store from location dicts as found in the JSON files"""
+        store = cls(stride)
+        store.extend(locations)
+        return store
+    
+    @classmethod
+    def from_columns(cls, stride: int, names: List[str], lengths: array, cordinates: array) -> "LocationStore":
+        """Wrap ready-made columns, e.g. read back from a snapshot"""
+        store = cls(stride)
+        store._names = names
+        store._lengths = lengths
+        store._cordinates = cordinates
+        return store
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    @property
+    def stride(self) -> int:
+        return self._stride
+    
+    def append(self, name: str, cordinates: Optional[List[float]] = None) -> int:
+        """Add a location and return its id; values beyond the stride are ignored"""
+        values = list(cordinates or ())[:self._stride]
+        self._names.append(sys.intern(str(name)))
+        self._lengths.append(len(values))
+        self._cordinates.extend(float(value) for value in values)
+        self._cordinates.extend(0.0 for _ in range(self._stride - len(values)))
+        return len(self._names) - 1
+    
+    def extend(self, locations: Iterable[Dict[str, Any]]) -> None:
+        """Add location dicts as found in the JSON files"""
+        for location in locations:
+            self.append(location.get("name", "Unknown"), location.get("cordinates") or location.get("coordinates"))
+    
+    def extend_store(self, other: "LocationStore") -> None:
+        """Append every location of another store with the same stride"""
+        if other.stride != self._stride:
+            raise ValueError(f"Cannot merge a stride {other.stride} store into a stride {self._stride} store")
+        self._names.extend(other._names)
+        self._lengths.extend(other._lengths)
+        self._cordinates.extend(other._cordinates)
+    
+    def name(self, location_id: int) -> str:
+        return self._names[location_id]
+    
+    def names(self) -> List[str]:
+        """All names in id order (the store's own list; do not modify)"""
+        return self._names
+    
+    def cordinates(self, location_id: int) -> Optional[List[float]]:
+        """Coordinates of a location, or None if it has none"""
+        length = self._lengths[location_id]
+        if not length:
+            return None
+        start = location_id * self._stride
+        return self._cordinates[start:start + length].tolist()
+    
+    def iter_cordinates(self) -> Iterator[Optional[List[float]]]:
+        return (self.cordinates(location_id) for location_id in range(len(self._names)))
+    
+    def location(self, location_id: int) -> Dict[str, Any]:
+        """Location dict in the shape the JSON files and the app controller use"""
+        return {"name": self._names[location_id], "cordinates": self.cordinates(location_id)}
+    
+    def find(self, name: str) -> Optional[int]:
+        """Id of the first location with this name, or None"""
+        try:
+            return self._names.index(name)
+        except ValueError:
+            return None
+
+
+class LocationDiff:
+    """Difference between two location stores, matched by name
+    
+    `id_map` maps each surviving old id to its new id, `added` holds new ids,
+    `removed` old ids, and `changed` the new ids whose coordinates differ.
+    Repeated names are paired up in file order.
+    """
+    
+    def __init__(self, id_map: Dict[int, int], added: List[int], removed: List[int], changed: List[int]):
+        self.id_map = id_map
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+    
+    def __bool__(self) -> bool:
+        """True if anything differs, including a pure reordering"""
+        return bool(self.added or self.removed or self.changed
+                    or any(old_id != new_id for old_id, new_id in self.id_map.items()))
+    
+    def __repr__(self) -> str:
+        return (f"LocationDiff(added={len(self.added)}, removed={len(self.removed)}, "
+                f"changed={len(self.changed)})")
+
+
+def diff_location_stores(old: LocationStore, new: LocationStore) -> LocationDiff:
+    """Compare two stores location by location"""
+    positions: Dict[str, List[int]] = {}
+    for old_id in range(len(old) - 1, -1, -1):
+        positions.setdefault(old.name(old_id), []).append(old_id)
+    id_map: Dict[int, int] = {}
+    added, changed = [], []
+    for new_id, name in enumerate(new.names()):
+        old_ids = positions.get(name)
+        if not old_ids:
+            added.append(new_id)
+            continue
+        old_id = old_ids.pop()
+        id_map[old_id] = new_id
+        if old.cordinates(old_id) != new.cordinates(new_id):
+            changed.append(new_id)
+    removed = [old_id for old_id in range(len(old)) if old_id not in id_map]
+    return LocationDiff(id_map, added, removed, changed)
+
+
+# Sidecar snapshot of parsed location stores, written next to the source JSON.
+# Header: magic, format version, section count, then the source file's mtime
+# (ns), size and BLAKE2b digest. Each section: key length, stride, location
+# count and name bytes, followed by the key, per-location coordinate counts,
+# little-endian doubles and the NUL-separated UTF-8 names.
+SNAPSHOT_SUFFIX = ".snapshot"
+SNAPSHOT_MAGIC = b"LOCSNAP\0"
+SNAPSHOT_VERSION = 1
+_SNAPSHOT_HEADER = struct.Struct("<8sHHqq16s")
+_SNAPSHOT_SECTION = struct.Struct("<HHII")
+_SNAPSHOT_MTIME_OFFSET = struct.calcsize("<8sHH")
+
+
+def _file_digest(path: str) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+def write_location_snapshot(path: str, stores: Dict[str, LocationStore], source_stat: os.stat_result) -> bool:
+    """Write the stores parsed from `path` to its sidecar snapshot.
+    
+    `source_stat` is the stat taken before parsing; nothing is written if the
+    file has changed since, or if a name cannot be stored. Returns whether a
+    snapshot was written. The snapshot is only a cache, so I/O errors are
+    swallowed.
+    """
+    try:
+        digest = _file_digest(path)
+        stat = os.stat(path)
+        if (stat.st_mtime_ns, stat.st_size) != (source_stat.st_mtime_ns, source_stat.st_size):
+            return False
+        parts = [_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(stores),
+                                       stat.st_mtime_ns, stat.st_size, digest)]
+        for key, store in stores.items():
+            if any("\0" in name for name in store.names()):
+                return False
+            key_bytes = key.encode("utf-8")
+            names = "\0".join(store.names()).encode("utf-8")
+            cordinates = array('d', store._cordinates)
+            if sys.byteorder == "big":
+                cordinates.byteswap()
+            parts += [_SNAPSHOT_SECTION.pack(len(key_bytes), store.stride, len(store), len(names)),
+                      key_bytes, store._lengths.tobytes(), cordinates.tobytes(), names]
+        temp_path = f"{path}{SNAPSHOT_SUFFIX}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.writelines(parts)
+        os.replace(temp_path, path + SNAPSHOT_SUFFIX)
+        return True
+    except OSError:
+        return False
+
+
+def read_location_snapshot(path: str) -> Optional[Dict[str, LocationStore]]:
+    """Load the stores cached for `path`, or None if there is no valid snapshot.
+    
+    A snapshot is trusted when the source's mtime and size match its header.
+    If only the mtime differs (the file was touched or copied) the source is
+    hashed, and a matching digest revalidates the snapshot in place.
+    """
+    snapshot_path = path + SNAPSHOT_SUFFIX
+    try:
+        stat = os.stat(path)
+        with open(snapshot_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _SNAPSHOT_HEADER.size:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, version, sections, mtime_ns, size, digest = _SNAPSHOT_HEADER.unpack_from(mm, 0)
+                if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or size != stat.st_size:
+                    return None
+                if mtime_ns != stat.st_mtime_ns:
+                    if _file_digest(path) != digest:
+                        return None
+                    revalidate = True
+                else:
+                    revalidate = False
+                stores: Dict[str, LocationStore] = {}
+                view = memoryview(mm)
+                try:
+                    offset = _SNAPSHOT_HEADER.size
+                    for _ in range(sections):
+                        key_size, stride, count, names_size = _SNAPSHOT_SECTION.unpack_from(mm, offset)
+                        offset += _SNAPSHOT_SECTION.size
+                        key = bytes(view[offset:offset + key_size]).decode("utf-8")
+                        offset += key_size
+                        lengths = array('B', view[offset:offset + count])
+                        offset += count
+                        cordinates = array('d')
+                        cordinates.frombytes(view[offset:offset + count * stride * 8])
+                        if sys.byteorder == "big":
+                            cordinates.byteswap()
+                        offset += count * stride * 8
+                        names = str(view[offset:offset + names_size], "utf-8").split("\0") if count else []
+                        offset += names_size
+                        if len(names) != count or len(cordinates) != count * stride:
+                            return None
+                        stores[key] = LocationStore.from_columns(stride, names, lengths, cordinates)
+                finally:
+                    view.release()
+        if revalidate:
+            with open(snapshot_path, "r+b") as f:
+                f.seek(_SNAPSHOT_MTIME_OFFSET)
+                f.write(struct.pack("<q", stat.st_mtime_ns))
+        return stores
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def iter_json_array(path: str, key: str, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """Yield the elements of the array stored under `key` in a JSON file, one at a time.
+    
+    The file is read and decoded a chunk at a time, so only the element being
+    parsed and one chunk of text are held in memory. Plain reads rather than a
+    memory map: a file truncated while it is being read (an editor saving in
+    place) then ends the stream with an error instead of a SIGBUS. Yields
+    nothing if the file is empty or does not contain the key.
+    """
+    decoder = json.JSONDecoder()
+    needle = json.dumps(key).encode("utf-8")
+    with open(path, "rb") as f:
+        # Find the key and the bracket opening its array
+        head = b""
+        while True:
+            data = f.read(chunk_size)
+            head += data
+            key_at = head.find(needle)
+            position = head.find(b"[", key_at) if key_at >= 0 else -1
+            if position >= 0:
+                break
+            if not data:
+                return
+            if key_at < 0:
+                # Keep enough to match a key split across two reads
+                head = head[-len(needle):]
+        if head[key_at:position].split(b'"')[-1].strip() != b":":
+            raise ValueError(f"{key!r} is not followed by a JSON array")
+        data = head[position + 1:]
+        utf8 = codecs.getincrementaldecoder("utf-8")()
+        buffer, offset, eof = utf8.decode(data), 0, False
+        while True:
+            # Skip separators between elements
+            while offset < len(buffer) and buffer[offset] in " \t\r\n,":
+                offset += 1
+            needs_more = offset >= len(buffer)
+            if not needs_more:
+                if buffer[offset] == "]":
+                    return
+                try:
+                    item, end = decoder.raw_decode(buffer, offset)
+                    # Only trust a value once its separator is in the buffer;
+                    # otherwise it may be cut short (e.g. "12" of "12.5")
+                    after = end
+                    while after < len(buffer) and buffer[after] in " \t\r\n":
+                        after += 1
+                    needs_more = after == len(buffer) or buffer[after] not in ",]"
+                except json.JSONDecodeError:
+                    needs_more = True
+                if needs_more and eof:
+                    raise ValueError(f"Malformed {key!r} array in {path}")
+                if not needs_more:
+                    yield item
+                    offset = end
+                    continue
+            if eof:
+                raise ValueError(f"Malformed {key!r} array in {path}")
+            # Drop consumed text and read the next chunk
+            data = f.read(chunk_size)
+            eof = not data
+            buffer = buffer[offset:] + utf8.decode(data, final=eof)
+            offset = 0
+
+
+class LocationSearchIndex:
+    """In-memory index over location names for search-as-you-type filtering.
+    
+    Every query is a case-insensitive substring match, whatever its length.
+    Each name is indexed under all of its 1-, 2- and 3-character grams, so a
+    query of up to three characters is a single posting-list lookup and a
+    longer one intersects the postings of its trigrams before checking the
+    candidates. A longer query that extends the previous one only re-checks
+    the previous result, so each keystroke narrows a shrinking set.
+    """
+    
+    GRAM = 3
+    
+    def __init__(self, names: Iterable[str]):
+        self._names: List[str] = []
+        self._grams: Dict[str, List[int]] = {}
+        for location_id, name in enumerate(names):
+            lowered = name.lower()
+            self._names.append(lowered)
+            grams = set()
+            for size in range(1, self.GRAM + 1):
+                grams.update(lowered[i:i + size] for i in range(len(lowered) - size + 1))
+            for gram in grams:
+                self._grams.setdefault(gram, []).append(location_id)
+        self._last_query = ""
+        self._last_result: Optional[List[int]] = None
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def search(self, query: str) -> Optional[List[int]]:
+        """Return matching location ids in ascending order, or None when there is no filter"""
+        query = query.strip().lower()
+        if not query:
+            result = None
+        elif len(query) <= self.GRAM:
+            # Postings are built in id order, so they are the answer as they stand
+            result = list(self._grams.get(query, ()))
+        elif self._last_result is not None and query.startswith(self._last_query):
+            # Narrow the previous result instead of starting over
+            result = [i for i in self._last_result if query in self._names[i]]
+        else:
+            result = self._gram_search(query)
+        self._last_query = query
+        self._last_result = result
+        return result
+    
+    def _gram_search(self, query: str) -> List[int]:
+        postings = []
+        for gram in {query[i:i + self.GRAM] for i in range(len(query) - self.GRAM + 1)}:
+            ids = self._grams.get(gram)
+            if not ids:
+                return []
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates.intersection_update(ids)
+            if not candidates:
+                return []
+        return sorted(i for i in candidates if query in self._names[i])
+
+
+class SpatialIndex:
+    """Uniform-grid spatial index over the x/y of location coordinates.
+    
+    Points are bucketed into square cells sized for a couple of points per
+    cell, so nearest and radius queries only visit the cells around the query
+    point instead of scanning every location. Ids are positions in the input;
+    entries without at least two coordinates are left out.
+    """
+    
+    def __init__(self, coordinates: Iterable[Optional[List[float]]], points_per_cell: float = 2.0):
+        # x/y per id in flat arrays; ids without coordinates hold NaN and are never bucketed
+        self._xs = array('d')
+        self._ys = array('d')
+        self._count = 0
+        for cord in coordinates:
+            if cord and len(cord) >= 2:
+                self._xs.append(float(cord[0]))
+                self._ys.append(float(cord[1]))
+                self._count += 1
+            else:
+                self._xs.append(math.nan)
+                self._ys.append(math.nan)
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        if not self._count:
+            self._cell_size = 1.0
+            return
+        xs = [x for x in self._xs if x == x]
+        ys = [y for y in self._ys if y == y]
+        self._min_x, self._min_y = min(xs), min(ys)
+        # Size cells from the longer side so colinear layouts (a row of bases) stay sane
+        extent = max(max(xs) - self._min_x, max(ys) - self._min_y)
+        self._cell_size = extent / math.sqrt(self._count / points_per_cell) if extent > 0 else 1.0
+        self._cell_size = max(self._cell_size, 1e-6)
+        for location_id, (x, y) in enumerate(zip(self._xs, self._ys)):
+            if x == x:
+                self._cells.setdefault(self._cell_of(x, y), []).append(location_id)
+        self._max_ring = max(max(cx for cx, _ in self._cells), max(cy for _, cy in self._cells)) + 1
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def _cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        return (int((x - self._min_x) // self._cell_size), int((y - self._min_y) // self._cell_size))
+    
+    def _ring(self, cx: int, cy: int, ring: int) -> Iterable[int]:
+        """Yield the ids in the square ring of cells at Chebyshev distance `ring`"""
+        if ring == 0:
+            yield from self._cells.get((cx, cy), ())
+            return
+        # Only walk the part of the ring that overlaps occupied cells
+        x0, x1 = max(cx - ring, 0), min(cx + ring, self._max_ring)
+        y0, y1 = max(cy - ring + 1, 0), min(cy + ring - 1, self._max_ring)
+        for row in (cy - ring, cy + ring):
+            if 0 <= row <= self._max_ring:
+                for column in range(x0, x1 + 1):
+                    yield from self._cells.get((column, row), ())
+        for column in (cx - ring, cx + ring):
+            if 0 <= column <= self._max_ring:
+                for row in range(y0, y1 + 1):
+                    yield from self._cells.get((column, row), ())
+    
+    def nearest(self, x: float, y: float, count: int = 1) -> List[int]:
+        """Return up to `count` ids ordered by distance from (x, y)"""
+        if not self._count or count <= 0:
+            return []
+        count = min(count, self._count)
+        cx, cy = self._cell_of(x, y)
+        # Cells between the query and the occupied area along each axis
+        gap_x = max(0, -cx, cx - self._max_ring)
+        gap_y = max(0, -cy, cy - self._max_ring)
+        ring = max(gap_x, gap_y)  # closer rings cannot touch the occupied cells
+        last_ring = ring + self._max_ring + 1
+        best: List[Tuple[float, int]] = []  # max-heap of the closest ids, as negated distances
+        while ring <= last_ring:
+            for location_id in self._ring(cx, cy, ring):
+                px, py = self._xs[location_id], self._ys[location_id]
+                distance = (px - x) ** 2 + (py - y) ** 2
+                if len(best) < count:
+                    heappush(best, (-distance, location_id))
+                elif distance < -best[0][0]:
+                    heapreplace(best, (-distance, location_id))
+            # Stop once no unvisited cell (outside this ring, inside the occupied
+            # area) can hold anything closer than the current worst match
+            if len(best) == count:
+                outer = ring + 1
+                bound = min(math.hypot(max(outer, gap_x) - 1, max(gap_y - 1, 0)),
+                            math.hypot(max(gap_x - 1, 0), max(outer, gap_y) - 1)) * self._cell_size
+                if -best[0][0] <= bound * bound:
+                    break
+            ring += 1
+        return [location_id for _, location_id in sorted((-d, i) for d, i in best)]
+    
+    def closest(self, x: float, y: float) -> Optional[int]:
+        """Return the id closest to (x, y), or None if the index is empty"""
+        result = self.nearest(x, y, 1)
+        return result[0] if result else None
+    
+    def within_radius(self, x: float, y: float, radius: float) -> List[int]:
+        """Return the ids within `radius` of (x, y), ordered by distance"""
+        if not self._count or radius < 0:
+            return []
+        (x0, y0), (x1, y1) = self._cell_of(x - radius, y - radius), self._cell_of(x + radius, y + radius)
+        limit = radius * radius
+        found = []
+        for cx in range(max(x0, 0), min(x1, self._max_ring) + 1):
+            for cy in range(max(y0, 0), min(y1, self._max_ring) + 1):
+                for location_id in self._cells.get((cx, cy), ()):
+                    px, py = self._xs[location_id], self._ys[location_id]
+                    distance = (px - x) ** 2 + (py - y) ** 2
+                    if distance <= limit:
+                        found.append((distance, location_id))
+        found.sort()
+        return [location_id for _, location_id in found]
+
+
+def order_route_stops(points: List[Tuple[float, float]], end: Optional[Tuple[float, float]] = None,
+                      start: Optional[Tuple[float, float]] = None) -> List[int]:
+    """Order stops into a short path: nearest neighbour, then 2-opt
+    
+    Returns indexes into `points`. `end` (the return base) and `start` are
+    fixed endpoints when given. The nearest-neighbour pass grows the route
+    backwards from `end` so the stop closest to the base comes last; 2-opt then
+    reverses segments while that shortens the path. Fine for a few dozen stops.
+    """
+    count = len(points)
+    if count < 2:
+        return list(range(count))
+    # Node list: the stops, then the fixed endpoints
+    nodes = list(points) + [p for p in (end, start) if p is not None]
+    end_node = count if end is not None else None
+    start_node = len(nodes) - 1 if start is not None else None
+    distance = [[math.dist(a, b) for b in nodes] for a in nodes]
+    
+    # Nearest neighbour, from the base backwards when there is one
+    anchor = end_node if end_node is not None else start_node
+    remaining = set(range(count))
+    current = anchor if anchor is not None else 0
+    order = []
+    if anchor is None:
+        order.append(0)
+        remaining.discard(0)
+    while remaining:
+        row = distance[current]
+        current = min(remaining, key=row.__getitem__)
+        order.append(current)
+        remaining.discard(current)
+    if anchor is not None and anchor == end_node:
+        order.reverse()
+    
+    # 2-opt over the full path including fixed endpoints
+    route = ([start_node] if start_node is not None else []) + order + ([end_node] if end_node is not None else [])
+    first = 1 if start_node is not None else 0
+    last = len(route) - (2 if end_node is not None else 1)  # last movable position
+    improved = True
+    while improved:
+        improved = False
+        for i in range(first, last):
+            before = route[i - 1] if i > 0 else None
+            for j in range(i + 1, last + 1):
+                after = route[j + 1] if j + 1 < len(route) else None
+                a, b = route[i], route[j]
+                delta = 0.0
+                if before is not None:
+                    delta += distance[before][b] - distance[before][a]
+                if after is not None:
+                    delta += distance[a][after] - distance[b][after]
+                if delta < -1e-9:
+                    route[i:j + 1] = reversed(route[i:j + 1])
+                    improved = True
+                    before = route[i - 1] if i > 0 else None
+    return [node for node in route if node < count]
+
+
+DEFAULT_DELIVERY_LOCATIONS = [
+    {"name": "Table 1", "cordinates": [0.0, 0.0]},
+    {"name": "Table 2", "cordinates": [1.0, 0.0]},
+    {"name": "Table 3", "cordinates": [2.0, 0.0]},
+    {"name": "Table 4", "cordinates": [0.0, 1.0]},
+    {"name": "Table 5", "cordinates": [1.0, 1.0]},
+    {"name": "Table 6", "cordinates": [2.0, 1.0]}
+]
+
+
+DEFAULT_RETURN_LOCATIONS = {
+    "Base_Locations": [
+        {"name": "Base 1", "cordinates": [0.0, 0.0, 0.0, 0.0, 0.0, 1.0]},
+        {"name": "Base 2", "cordinates": [1.0, 0.0, 0.0, 0.0, 0.0, 1.0]},
+        {"name": "Base 3", "cordinates": [2.0, 0.0, 0.0, 0.0, 0.0, 1.0]}
+    ],
+    "Default_Base_Loc": [
+        {"name": "Base 1", "cordinates": [0.0, 0.0, 0.0, 0.0, 0.0, 1.0]}
+    ]
+}
+
+
+def prepare_return_locations(data: Optional[Dict[str, Any]]) -> Tuple[Dict[str, LocationStore], SpatialIndex]:
+    """Pack return/base locations into stores and build the spatial index over the bases"""
+    if data is None:
+        # Use default base locations if file doesn't exist
+        data = DEFAULT_RETURN_LOCATIONS
+    stores = {key: LocationStore.from_locations(data.get(key, []), stride=6)
+              for key in ("Base_Locations", "Default_Base_Loc")}
+    return stores, SpatialIndex(stores["Base_Locations"].iter_cordinates())
+
+
+def load_return_locations(path: str) -> Tuple[Dict[str, LocationStore], SpatialIndex]:
+    """Load return/base locations from their snapshot, or parse and snapshot the JSON"""
+    stores = read_location_snapshot(path)
+    if stores is not None and all(key in stores for key in ("Base_Locations", "Default_Base_Loc")):
+        return stores, SpatialIndex(stores["Base_Locations"].iter_cordinates())
+    if not os.path.exists(path):
+        return prepare_return_locations(None)
+    source_stat = os.stat(path)
+    with open(path, "r") as f:
+        data = json.load(f)
+    stores, spatial_index = prepare_return_locations(data)
+    write_location_snapshot(path, stores, source_stat)
+    return stores, spatial_index
+
+
+class LocationStreamLoader(QRunnable):
+    """Stream delivery locations from a JSON file on a QThreadPool worker thread
+    
+    Locations are parsed one at a time with `iter_json_array`, packed into
+    LocationStore batches and handed to the GUI thread through `chunk`, the
+    first batch a single page long, so
+    the grid can render before the file has been read completely. The search
+    and spatial indexes follow through `loaded` once the stream ends.
+    
+    The parsed locations are written to a sidecar snapshot; later loads map
+    that in and emit it as a single batch while it matches the source file.
+    """
+    
+    def __init__(self, key: str, request_id: int, path: str, array_key: str, signals: LocationLoaderSignals,
+                 defaults: Optional[List[Dict[str, Any]]] = None, first_batch: int = 16, batch_size: int = 2048,
+                 stride: int = 2, use_snapshot: bool = True):
+        super().__init__()
+        self._key = key
+        self._request_id = request_id
+        self._path = path
+        self._array_key = array_key
+        self._signals = signals
+        self._defaults = defaults or []
+        self._first_batch = first_batch
+        self._batch_size = batch_size
+        self._stride = stride
+        self._use_snapshot = use_snapshot
+    
+    @profiled()
+    def run(self) -> None:
+        """Stream the file (or its snapshot), then emit the indexes built over it"""
+        try:
+            store = self._read_snapshot()
+            if store is not None:
+                # Already parsed on an earlier start: hand over everything at once
+                if len(store):
+                    self._signals.chunk.emit(self._key, self._request_id, store)
+            else:
+                store = self._stream()
+            self._signals.loaded.emit(self._key, (self._request_id, LocationSearchIndex(store.names()),
+                                                  SpatialIndex(store.iter_cordinates())))
+        except RuntimeError:
+            # The receiving view was destroyed while we were parsing
+            pass
+        except Exception as e:
+            try:
+                self._signals.failed.emit(self._key, self._request_id, str(e))
+            except RuntimeError:
+                pass
+    
+    def _read_snapshot(self) -> Optional[LocationStore]:
+        if not self._use_snapshot:
+            return None
+        store = (read_location_snapshot(self._path) or {}).get(self._array_key)
+        return store if store is not None and store.stride == self._stride else None
+    
+    def _stream(self) -> LocationStore:
+        """Parse the JSON in batches, emitting each one, and snapshot the result"""
+        source_stat = None
+        if os.path.exists(self._path):
+            source_stat = os.stat(self._path)
+            source = iter_json_array(self._path, self._array_key)
+        else:
+            # Use default locations if file doesn't exist
+            source = iter(self._defaults)
+        store = LocationStore(self._stride)
+        batch, limit = LocationStore(self._stride), self._first_batch
+        for location in source:
+            batch.append(location.get("name", "Unknown"), location.get("cordinates"))
+            if len(batch) >= limit:
+                self._signals.chunk.emit(self._key, self._request_id, batch)
+                store.extend_store(batch)
+                batch, limit = LocationStore(self._stride), self._batch_size
+        if len(batch):
+            self._signals.chunk.emit(self._key, self._request_id, batch)
+            store.extend_store(batch)
+        if source_stat is not None and self._use_snapshot:
+            write_location_snapshot(self._path, {self._array_key: store}, source_stat)
+        return store
+
+
+class LocationReloader(QRunnable):
+    """Re-read a delivery location file that changed on disk
+    
+    The new locations are parsed in one go (through the snapshot cache),
+    diffed against the store the view currently shows and emitted through
+    `loaded` together with fresh indexes, so the view can apply only the delta.
+    """
+    
+    def __init__(self, key: str, request_id: int, path: str, array_key: str, current: LocationStore,
+                 signals: LocationLoaderSignals, defaults: Optional[List[Dict[str, Any]]] = None):
+        super().__init__()
+        self._key = key
+        self._request_id = request_id
+        self._path = path
+        self._array_key = array_key
+        self._current = current
+        self._signals = signals
+        self._defaults = defaults or []
+    
+    @profiled()
+    def run(self) -> None:
+        """Parse the file, diff it and emit the result"""
+        try:
+            stride = self._current.stride
+            store = (read_location_snapshot(self._path) or {}).get(self._array_key)
+            if store is None or store.stride != stride:
+                if os.path.exists(self._path):
+                    source_stat = os.stat(self._path)
+                    store = LocationStore(stride)
+                    store.extend(iter_json_array(self._path, self._array_key))
+                    write_location_snapshot(self._path, {self._array_key: store}, source_stat)
+                else:
+                    store = LocationStore.from_locations(self._defaults, stride)
+            diff = diff_location_stores(self._current, store)
+            if diff:
+                indexes = (LocationSearchIndex(store.names()), SpatialIndex(store.iter_cordinates()))
+            else:
+                indexes = (None, None)
+            self._signals.loaded.emit(self._key, (self._request_id, store, diff) + indexes)
+        except RuntimeError:
+            # The receiving view was destroyed while we were parsing
+            pass
+        except Exception as e:
+            try:
+                self._signals.failed.emit(self._key, self._request_id, str(e))
+            except RuntimeError:
+                pass
+
+
+DEFAULT_DELIVERY_LOCATION_FILE = "/home/pawan/pyside_app/Database/delivery_location.json"
+DEFAULT_RETURN_LOCATION_FILE = "/home/pawan/pyside_app/app/Database/event_data.json"
+
+
+class LocationRepository(QObject):
+    """Process-wide owner of the delivery and return/base location data
+    
+    The app controller creates one repository and hands it to every page that
+    needs locations, the same way it hands out the theme manager. Files are
+    read once, in the background, and kept current by a file watcher; pages
+    then share the same stores and indexes instead of loading their own copy.
+    Stores handed out are read-only for consumers: a reload swaps in a new
+    store rather than modifying the one pages hold, and only the store of an
+    initial load grows while its batches stream in.
+    
+    File paths come from the constructor, else the DELIVERY_LOCATION_FILE and
+    RETURN_LOCATION_FILE environment variables, else the installation defaults.
+    """
+    
+    delivery_batch = Signal(object)    # LocationStore batch just appended to delivery_locations
+    delivery_loaded = Signal()         # initial load finished; indexes are ready
+    delivery_changed = Signal(object)  # LocationDiff after a reload replaced delivery_locations
+    return_changed = Signal()          # return/base locations loaded or reloaded
+    
+    DELIVERY_FILE_ENV = "DELIVERY_LOCATION_FILE"
+    RETURN_FILE_ENV = "RETURN_LOCATION_FILE"
+    
+    _shared: Optional["LocationRepository"] = None
+    
+    def __init__(self, delivery_file: Optional[str] = None, return_file: Optional[str] = None,
+                 watch: bool = True, first_batch: int = 16, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._delivery_file = delivery_file or os.environ.get(self.DELIVERY_FILE_ENV) or DEFAULT_DELIVERY_LOCATION_FILE
+        self._return_file = return_file or os.environ.get(self.RETURN_FILE_ENV) or DEFAULT_RETURN_LOCATION_FILE
+        self._watch = watch
+        self._first_batch = first_batch
+        self._started = False
+        
+        # Delivery locations
+        self._delivery_locations = LocationStore(stride=2)
+        self._search_index: Optional[LocationSearchIndex] = None
+        self._spatial_index: Optional[SpatialIndex] = None
+        self._delivery_loading = False
+        self._delivery_reload_pending = False  # the file changed while a stream was being shown
+        self._delivery_request_id = 0  # ignores results from superseded loads
+        
+        # Return/base locations
+        self._return_locations: Dict[str, LocationStore] = {}
+        self._base_spatial_index: Optional[SpatialIndex] = None
+        
+        # Files are parsed off the GUI thread
+        self._loader_signals = LocationLoaderSignals(self)
+        self._loader_signals.loaded.connect(self._on_location_file_loaded)
+        self._loader_signals.chunk.connect(self._on_locations_streamed)
+        self._loader_signals.failed.connect(self._on_location_file_failed)
+        
+        # Hot reload when the files change on disk
+        self._file_watcher = QFileSystemWatcher(self)
+        self._file_watcher.fileChanged.connect(self._on_watched_path_changed)
+        self._file_watcher.directoryChanged.connect(self._on_watched_path_changed)
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(250)  # editors write in several steps; wait for them to settle
+        self._reload_timer.timeout.connect(self.reload)
+        self._file_stamps: Dict[str, Optional[Tuple[int, int]]] = {}
+    
+    @classmethod
+    def shared(cls) -> "LocationRepository":
+        """Repository used by pages that were not given one explicitly"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+    
+    @property
+    def delivery_file(self) -> str:
+        return self._delivery_file
+    
+    @property
+    def return_file(self) -> str:
+        return self._return_file
+    
+    @property
+    def delivery_locations(self) -> LocationStore:
+        return self._delivery_locations
+    
+    @property
+    def search_index(self) -> Optional[LocationSearchIndex]:
+        return self._search_index
+    
+    @property
+    def spatial_index(self) -> Optional[SpatialIndex]:
+        return self._spatial_index
+    
+    @property
+    def delivery_ready(self) -> bool:
+        """True once delivery locations and their indexes are complete"""
+        return self._started and not self._delivery_loading
+    
+    @property
+    def return_locations(self) -> Dict[str, LocationStore]:
+        return self._return_locations
+    
+    @property
+    def base_spatial_index(self) -> Optional[SpatialIndex]:
+        return self._base_spatial_index
+    
+    @property
+    def return_ready(self) -> bool:
+        return bool(self._return_locations)
+    
+    def load(self) -> None:
+        """Start loading both files; later calls do nothing"""
+        if self._started:
+            return
+        self._started = True
+        self._load_delivery_locations()
+        self._load_return_locations()
+        if self._watch:
+            self._watch_location_files()
+    
+    def reload(self) -> None:
+        """Reload whichever location files changed since they were read"""
+        if not self._started:
+            return
+        self._watch_location_files()
+        for key, path in self._watched_location_files().items():
+            stamp = self._file_stamp(path)
+            if stamp == self._file_stamps.get(path):
+                continue
+            self._file_stamps[path] = stamp
+            if key == "delivery":
+                self._reload_delivery_locations()
+            else:
+                self._load_return_locations()
+    
+    @profiled()
+    def _load_delivery_locations(self) -> None:
+        """Start streaming delivery locations into a fresh store"""
+        self._delivery_request_id += 1
+        self._delivery_loading = True
+        self._delivery_reload_pending = False
+        self._delivery_locations = LocationStore(stride=2)
+        self._search_index = None
+        self._spatial_index = None
+        QThreadPool.globalInstance().start(
+            LocationStreamLoader("delivery", self._delivery_request_id, self._delivery_file, "Delivery_Location",
+                                 self._loader_signals, DEFAULT_DELIVERY_LOCATIONS, self._first_batch, stride=2))
+    
+    @profiled()
+    def _load_return_locations(self) -> None:
+        """Start loading return/base locations in the background"""
+        QThreadPool.globalInstance().start(
+            LocationFileLoader("return", self._return_file, self._loader_signals, read=load_return_locations))
+    
+    def _reload_delivery_locations(self) -> None:
+        """Re-read the delivery file and publish only what changed"""
+        if self._delivery_loading:
+            if not len(self._delivery_locations):
+                # Nothing shown yet, so there is nothing to preserve; start over
+                self._load_delivery_locations()
+            else:
+                # Pages already show (and may have selections in) this stream;
+                # diff against it once it has finished
+                self._delivery_reload_pending = True
+            return
+        self._delivery_request_id += 1
+        QThreadPool.globalInstance().start(
+            LocationReloader("delivery_reload", self._delivery_request_id, self._delivery_file, "Delivery_Location",
+                             self._delivery_locations, self._loader_signals, DEFAULT_DELIVERY_LOCATIONS))
+    
+    def _watched_location_files(self) -> Dict[str, str]:
+        return {"delivery": self._delivery_file, "return": self._return_file}
+    
+    @staticmethod
+    def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _watch_location_files(self) -> None:
+        """Watch the location files and their folders (editors often replace files)"""
+        watched = set(self._file_watcher.files()) | set(self._file_watcher.directories())
+        for path in self._watched_location_files().values():
+            self._file_stamps.setdefault(path, self._file_stamp(path))
+            for candidate in (path, os.path.dirname(path)):
+                if candidate and candidate not in watched and os.path.exists(candidate):
+                    self._file_watcher.addPath(candidate)
+                    watched.add(candidate)
+    
+    def _on_watched_path_changed(self, path: str) -> None:
+        """Debounce change notifications into a single reload"""
+        self._reload_timer.start()
+    
+    def _on_location_file_loaded(self, key: str, data: Any) -> None:
+        """Take over a parsed location file on the GUI thread"""
+        try:
+            if key == "delivery":
+                self._apply_location_indexes(*data)
+            elif key == "delivery_reload":
+                self._apply_location_diff(*data)
+            elif key == "return":
+                self._apply_return_locations(*data)
+        except Exception as e:
+            self._on_location_file_failed(key, data[0] if key.startswith("delivery") else 0, str(e))
+    
+    def _on_locations_streamed(self, key: str, request_id: int, batch: LocationStore) -> None:
+        """Append a batch of streamed delivery locations and pass it on"""
+        if key != "delivery" or request_id != self._delivery_request_id:
+            return
+        self._delivery_locations.extend_store(batch)
+        self.delivery_batch.emit(batch)
+    
+    def _apply_location_indexes(self, request_id: int, search_index: LocationSearchIndex,
+                                spatial_index: SpatialIndex) -> None:
+        """Attach the indexes built once the delivery stream has finished"""
+        if request_id != self._delivery_request_id:
+            return
+        self._search_index = search_index
+        self._spatial_index = spatial_index
+        self._delivery_loading = False
+        self.delivery_loaded.emit()
+        if self._delivery_reload_pending:
+            self._delivery_reload_pending = False
+            self._reload_delivery_locations()
+    
+    @profiled()
+    def _apply_location_diff(self, request_id: int, locations: LocationStore, diff: LocationDiff,
+                             search_index: Optional[LocationSearchIndex],
+                             spatial_index: Optional[SpatialIndex]) -> None:
+        """Swap in reloaded delivery locations if anything changed"""
+        if request_id != self._delivery_request_id or not diff:
+            return
+        self._delivery_locations = locations
+        self._search_index = search_index
+        self._spatial_index = spatial_index
+        self.delivery_changed.emit(diff)
+    
+    def _apply_return_locations(self, stores: Dict[str, LocationStore], spatial_index: SpatialIndex) -> None:
+        self._return_locations = stores
+        self._base_spatial_index = spatial_index
+        self.return_changed.emit()
+    
+    def _on_location_file_failed(self, key: str, request_id: int, error: str) -> None:
+        """Fall back to empty data when a location file cannot be parsed"""
+        if key.startswith("delivery") and request_id != self._delivery_request_id:
+            # A superseded load; the newer one is still running
+            return
+        if key == "delivery_reload":
+            # Probably caught mid-save; keep the current data until the next change
+            print(f"Error reloading delivery locations: {error}")
+        elif key == "delivery":
+            print(f"Error loading delivery locations: {error}")
+            self._delivery_locations = LocationStore(stride=2)
+            self._apply_location_indexes(self._delivery_request_id, LocationSearchIndex(()), SpatialIndex(()))
+        elif key == "return" and self._return_locations:
+            # A reload caught mid-save; keep the bases already loaded
+            print(f"Error reloading return locations: {error}")
+        elif key == "return":
+            print(f"Error loading return locations: {error}")
+            self._apply_return_locations(*prepare_return_locations({}))
+
+
+DEFAULT_DELIVERY_JOURNAL_DIR = "/home/pawan/pyside_app/Database/delivery_journal"
+
+
+class DeliveryJournal:
+    """Append-only JSON-lines history of dispatched deliveries
+    
+    One file per day (delivery_journal-YYYY-MM-DD.jsonl) in the journal
+    folder, so a day's history is a single sequential read and old days are
+    pruned by deleting files. `record` only queues the entry; a background
+    thread appends queued entries in batches and fsyncs at most once per
+    `fsync_interval` seconds. Reads see everything recorded so far.
+    
+    The folder comes from the constructor, else the DELIVERY_JOURNAL_DIR
+    environment variable, else the installation default.
+    """
+    
+    DIR_ENV = "DELIVERY_JOURNAL_DIR"
+    FILE_PREFIX = "delivery_journal-"
+    
+    _shared: Optional["DeliveryJournal"] = None
+    
+    def __init__(self, directory: Optional[str] = None, fsync_interval: float = 1.0, retention_days: int = 90):
+        self._directory = directory or os.environ.get(self.DIR_ENV) or DEFAULT_DELIVERY_JOURNAL_DIR
+        self._fsync_interval = fsync_interval
+        self._retention_days = retention_days
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()  # guards the indexes, the pending count and the writer thread
+        self._index: Dict[str, Dict[str, List[int]]] = {}  # day -> location name -> line offsets
+        self._building: Dict[str, Dict[str, List[int]]] = {}  # same, for lines flushed while a day is scanned
+        self._pending = 0
+    
+    @classmethod
+    def shared(cls) -> "DeliveryJournal":
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+    
+    @property
+    def directory(self) -> str:
+        return self._directory
+    
+    def path_for(self, day: str) -> str:
+        """Journal file for a day given as YYYY-MM-DD"""
+        return os.path.join(self._directory, f"{self.FILE_PREFIX}{day}.jsonl")
+    
+    def days(self) -> List[str]:
+        """Days with a journal file, oldest first"""
+        try:
+            names = os.listdir(self._directory)
+        except OSError:
+            return []
+        return sorted(name[len(self.FILE_PREFIX):-len(".jsonl")] for name in names
+                      if name.startswith(self.FILE_PREFIX) and name.endswith(".jsonl"))
+    
+    def record(self, entry: Dict[str, Any]) -> None:
+        """Queue an entry for writing; never blocks on disk"""
+        entry.setdefault("recorded_at", time.time())
+        with self._lock:
+            self._pending += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._write_loop, name="DeliveryJournal", daemon=True)
+                self._thread.start()
+        self._queue.put(entry)
+    
+    def record_job(self, job: "DeliveryJob") -> None:
+        """Record how a dispatched delivery ended"""
+        data = job.data
+        locations = data.get("locations") or [data.get("location")]
+        self.record({
+            "job": job.job_id,
+            "delivery_type": data.get("delivery_type"),
+            "locations": [location["name"] for location in locations if location],
+            "return_location": (data.get("return_location") or {}).get("name"),
+            "submitted_at": job.submitted_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+            "outcome": job.state,
+            "error": job.error,
+        })
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything recorded so far is on disk"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if not self._pending:
+                    return True
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.005)
+    
+    def close(self) -> None:
+        """Flush and stop the writer thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+    
+    def _write_loop(self) -> None:
+        day, handle = None, None
+        last_sync, unsynced = time.monotonic(), False
+        try:
+            while True:
+                try:
+                    # With unsynced data waiting, wake up in time to fsync it
+                    batch = [self._queue.get(timeout=self._fsync_interval if unsynced else None)]
+                except queue.Empty:
+                    batch = []
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = None in batch
+                entries = [entry for entry in batch if entry is not None]
+                written: List[Tuple[str, Dict[str, Any], int]] = []  # indexed once their bytes are flushed
+                try:
+                    for entry in entries:
+                        entry_day = time.strftime("%Y-%m-%d", time.localtime(entry["recorded_at"]))
+                        if entry_day != day:
+                            # Rotate: each day gets its own file
+                            if handle is not None:
+                                handle.flush()
+                                os.fsync(handle.fileno())
+                                handle.close()
+                                handle = None
+                                self._index_entries(written)
+                                written = []
+                            os.makedirs(self._directory, exist_ok=True)
+                            handle = open(self.path_for(entry_day), "ab")
+                            day = entry_day
+                            self._prune()
+                        offset = handle.tell()
+                        handle.write((json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8"))
+                        written.append((day, entry, offset))
+                    if handle is not None:
+                        handle.flush()
+                        # Readers seek to indexed offsets; only publish lines that are on disk
+                        self._index_entries(written)
+                        unsynced = unsynced or bool(entries)
+                        if unsynced and (stop or time.monotonic() - last_sync >= self._fsync_interval):
+                            os.fsync(handle.fileno())
+                            last_sync, unsynced = time.monotonic(), False
+                except OSError as e:
+                    print(f"Error writing delivery journal: {e}")
+                    if handle is not None:
+                        handle.close()
+                    day, handle, unsynced = None, None, False
+                with self._lock:
+                    self._pending -= len(entries)
+                if stop:
+                    return
+        finally:
+            if handle is not None:
+                handle.close()
+    
+    def _index_entries(self, written: List[Tuple[str, Dict[str, Any], int]]) -> None:
+        """Add flushed (day, entry, offset) lines to the location index of days that are indexed"""
+        with self._lock:
+            for day, entry, offset in written:
+                names = self._index.get(day)
+                if names is None:
+                    names = self._building.get(day)
+                if names is None:
+                    continue
+                for name in entry.get("locations") or ():
+                    offsets = names.setdefault(name, [])
+                    if not offsets or offsets[-1] < offset:  # an index build may already have it
+                        offsets.append(offset)
+    
+    def _prune(self) -> None:
+        """Delete day files older than the retention period"""
+        if self._retention_days <= 0:
+            return
+        cutoff = time.strftime("%Y-%m-%d", time.localtime(time.time() - self._retention_days * 86400))
+        for day in self.days():
+            if day < cutoff:
+                try:
+                    os.remove(self.path_for(day))
+                except OSError:
+                    pass
+                with self._lock:
+                    self._index.pop(day, None)
+                    self._building.pop(day, None)
+    
+    def read_day(self, day: Optional[str] = None) -> List[Dict[str, Any]]:
+        """All entries of a day (default today), oldest first"""
+        day = day or time.strftime("%Y-%m-%d")
+        try:
+            with open(self.path_for(day), "rb") as f:
+                lines = f.read().split(b"\n")
+        except OSError:
+            return []
+        # The last piece is empty, or a line the writer is still in the middle of
+        return [json.loads(line) for line in lines[:-1] if line.strip()]
+    
+    def tail(self, count: int) -> List[Dict[str, Any]]:
+        """The last `count` entries across days, oldest first"""
+        lines: List[bytes] = []
+        for day in reversed(self.days()):
+            lines = self._tail_lines(self.path_for(day), count - len(lines)) + lines
+            if len(lines) >= count:
+                break
+        return [json.loads(line) for line in lines]
+    
+    @staticmethod
+    def _tail_lines(path: str, count: int, block_size: int = 64 * 1024) -> List[bytes]:
+        """Last `count` complete lines of a file, read backwards a block at a time"""
+        if count <= 0:
+            return []
+        try:
+            with open(path, "rb") as f:
+                end = f.seek(0, os.SEEK_END)
+                data, position = b"", end
+                while position > 0 and data.count(b"\n") <= count:
+                    step = min(block_size, position)
+                    position -= step
+                    f.seek(position)
+                    data = f.read(step) + data
+        except OSError:
+            return []
+        lines = [line for line in data.split(b"\n") if line.strip()]
+        if position > 0:
+            lines = lines[1:]  # the first line may be cut short
+        # The writer may be mid-line at the very end
+        if lines and not data.endswith(b"\n"):
+            lines = lines[:-1]
+        return lines[-count:]
+    
+    def entries_for_location(self, name: str, day: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Entries of a day (default today) that include a location, through the location index"""
+        day = day or time.strftime("%Y-%m-%d")
+        path = self.path_for(day)
+        with self._lock:
+            names = self._index.get(day)
+            if names is None:
+                # The writer indexes lines flushed during the scan here
+                live = self._building.setdefault(day, {})
+        if names is None:
+            # Scanned without the lock, so record() never waits for it
+            scanned, end = self._build_index(path)
+            with self._lock:
+                names = self._index.get(day)
+                if names is None:
+                    # The scan has every line before `end`; the writer the rest
+                    for location, offsets in self._building.pop(day, live).items():
+                        scanned.setdefault(location, []).extend(offset for offset in offsets if offset >= end)
+                    names = self._index[day] = scanned
+        with self._lock:
+            offsets = list(names.get(name, ()))
+        entries = []
+        try:
+            with open(path, "rb") as f:
+                for offset in offsets:
+                    f.seek(offset)
+                    entries.append(json.loads(f.readline()))
+        except OSError:
+            pass
+        return entries
+    
+    @staticmethod
+    def _build_index(path: str) -> Tuple[Dict[str, List[int]], int]:
+        """Location index of a day file, and the offset just past its last complete line"""
+        names: Dict[str, List[int]] = {}
+        offset = 0
+        try:
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # still being written
+                    for location in json.loads(line).get("locations") or ():
+                        names.setdefault(location, []).append(offset)
+                    offset += len(line)
+        except OSError:
+            pass
+        return names, offset
+
+
+def thread_safe(func: Callable) -> Callable:
+    """Mark delivery work as safe to call off the GUI thread
+    
+    DeliveryDispatcher only runs marked work on its worker thread; anything
+    else (e.g. a controller that also shows messages) is called on the GUI
+    thread.
+    """
+    func.thread_safe = True
+    return func
+
+
+class DeliveryJob:
+    """Handle for one delivery dispatched through a DeliveryDispatcher
+    
+    While its work runs (on the worker thread or, for work not marked
+    `thread_safe`, on the GUI thread) the job is found with
+    `DeliveryJob.current()` to report progress and to check `cancelled`
+    between slow steps. A timed out or cancelled job is only flagged; the
+    work itself stops at its next check, and any result it still returns is
+    dropped.
+    """
+    
+    QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED = "queued", "running", "completed", "failed", "cancelled"
+    
+    _local = threading.local()
+    
+    def __init__(self, job_id: int, data: Dict[str, Any], key: Optional[str], dispatcher: "DeliveryDispatcher"):
+        self.job_id = job_id
+        self.data = data
+        self.key = key
+        self.state = self.QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._dispatcher = dispatcher
+        self._cancelled = threading.Event()
+    
+    @classmethod
+    def current(cls) -> Optional["DeliveryJob"]:
+        """The job whose work is running on the calling thread, if any"""
+        return getattr(cls._local, "job", None)
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+    
+    @property
+    def finished(self) -> bool:
+        return self.state in (self.COMPLETED, self.FAILED, self.CANCELLED)
+    
+    def cancel(self) -> None:
+        """Cancel the job; a queued job never starts"""
+        self._dispatcher.cancel(self)
+    
+    def report_progress(self, percent: int, message: str = "") -> None:
+        """Publish progress from the worker thread"""
+        if not self.cancelled:
+            try:
+                self._dispatcher.progress.emit(self, int(percent), message)
+            except RuntimeError:
+                pass
+    
+    def __repr__(self) -> str:
+        return f"DeliveryJob({self.job_id}, {self.state})"
+
+
+class _DeliveryJobRunner(QRunnable):
+    """Run one delivery job's work on the dispatcher's worker thread"""
+    
+    def __init__(self, job: DeliveryJob, work: Callable[[Dict[str, Any]], Any], signals: "DeliveryDispatcher"):
+        super().__init__()
+        self._job = job
+        self._work = work
+        self._signals = signals
+    
+    @profiled("DeliveryJob.run")
+    def run(self) -> None:
+        job = self._job
+        if job.cancelled:
+            return
+        DeliveryJob._local.job = job
+        try:
+            self._signals._job_started.emit(job)
+            result = self._work(job.data)
+            self._signals._job_finished.emit(job, result, None)
+        except Exception as e:
+            try:
+                self._signals._job_finished.emit(job, None, str(e) or type(e).__name__)
+            except RuntimeError:
+                pass
+        finally:
+            DeliveryJob._local.job = None
+
+
+class DeliveryDispatcher(QObject):
+    """Serial job queue that runs delivery requests off the GUI thread
+    
+    `submit` returns a DeliveryJob handle straight away. Work marked
+    `thread_safe` runs on a single worker thread, one job at a time, in
+    submission order; other work is called on the GUI thread once control
+    returns to the event loop, so its thread never changes. Results are
+    reported through the signals below on the GUI thread. Submitting a job
+    whose key matches one still queued or running returns that job instead,
+    so repeated taps dispatch only once. With a journal, every job is
+    recorded there once it settles.
+    
+    The timeout counts from submission, so jobs stuck in the queue fail too.
+    A timed out job that still holds the worker cannot be stopped; until it
+    returns, new worker jobs fail straight away instead of queueing behind it.
+    """
+    
+    started = Signal(object)              # DeliveryJob
+    progress = Signal(object, int, str)   # (DeliveryJob, percent, message)
+    completed = Signal(object, object)    # (DeliveryJob, result)
+    failed = Signal(object, str)          # (DeliveryJob, error); also for timeouts and cancellation
+    
+    _job_started = Signal(object)
+    _job_finished = Signal(object, object, object)  # (DeliveryJob, result, error or None)
+    
+    def __init__(self, timeout_ms: int = 30000, journal: Optional[DeliveryJournal] = None,
+                 parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._timeout_ms = timeout_ms
+        self._journal = journal
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._next_id = 0
+        self._active: Dict[int, DeliveryJob] = {}
+        self._timers: Dict[int, QTimer] = {}
+        self._running: Optional[DeliveryJob] = None  # job whose work holds the worker thread
+        self._gui_jobs: deque = deque()              # (DeliveryJob, work) to call on the GUI thread
+        self._gui_timer = QTimer(self)
+        self._gui_timer.setSingleShot(True)
+        self._gui_timer.setInterval(0)
+        self._gui_timer.timeout.connect(self._run_gui_job)
+        self._job_started.connect(self._on_worker_started)
+        self._job_finished.connect(self._on_worker_finished)
+    
+    def submit(self, work: Callable[[Dict[str, Any]], Any], data: Dict[str, Any],
+               key: Optional[str] = None) -> DeliveryJob:
+        """Queue `work(data)` and return its handle"""
+        if key is not None:
+            for job in self._active.values():
+                if job.key == key:
+                    return job
+        self._next_id += 1
+        job = DeliveryJob(self._next_id, data, key, self)
+        self._active[job.job_id] = job
+        self._start_timeout(job)
+        if not getattr(work, "thread_safe", False):
+            self._gui_jobs.append((job, work))
+            self._gui_timer.start()
+        elif self.worker_stalled:
+            # Reported from the event loop, once the caller holds the handle
+            QTimer.singleShot(0, self, lambda: self._finish(
+                job, DeliveryJob.FAILED, error="The previous delivery request is still running"))
+        else:
+            self._pool.start(_DeliveryJobRunner(job, work, self))
+        return job
+    
+    @property
+    def worker_stalled(self) -> bool:
+        """Whether a timed out or cancelled job's work still holds the worker thread"""
+        return self._running is not None and self._running.finished
+    
+    def active_jobs(self) -> List[DeliveryJob]:
+        return list(self._active.values())
+    
+    def cancel(self, job: DeliveryJob) -> None:
+        self._finish(job, DeliveryJob.CANCELLED, error="Cancelled")
+    
+    def cancel_all(self) -> None:
+        for job in list(self._active.values()):
+            self.cancel(job)
+    
+    def wait_for_done(self, msecs: int = -1) -> bool:
+        """Block until the worker is idle (for shutdown and tests)"""
+        return self._pool.waitForDone(msecs)
+    
+    def _start_timeout(self, job: DeliveryJob) -> None:
+        if self._timeout_ms > 0:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda: self._finish(job, DeliveryJob.FAILED,
+                                                       error=f"Timed out after {self._timeout_ms / 1000:g} s"))
+            timer.start(self._timeout_ms)
+            self._timers[job.job_id] = timer
+    
+    def _run_gui_job(self) -> None:
+        """Call the next job's work on the GUI thread, one per pass through the event loop"""
+        if not self._gui_jobs:
+            return
+        job, work = self._gui_jobs.popleft()
+        if self._gui_jobs:
+            self._gui_timer.start()
+        if job.finished:
+            return
+        DeliveryJob._local.job = job
+        try:
+            self._on_job_started(job)
+            result = work(job.data)
+        except Exception as e:
+            self._on_job_finished(job, None, str(e) or type(e).__name__)
+        else:
+            self._on_job_finished(job, result, None)
+        finally:
+            DeliveryJob._local.job = None
+    
+    def _on_worker_started(self, job: DeliveryJob) -> None:
+        self._running = job
+        self._on_job_started(job)
+    
+    def _on_worker_finished(self, job: DeliveryJob, result: Any, error: Optional[str]) -> None:
+        if self._running is job:
+            self._running = None
+        self._on_job_finished(job, result, error)
+    
+    def _on_job_started(self, job: DeliveryJob) -> None:
+        if job.finished:
+            return
+        job.state = DeliveryJob.RUNNING
+        job.started_at = time.time()
+        self.started.emit(job)
+    
+    def _on_job_finished(self, job: DeliveryJob, result: Any, error: Optional[str]) -> None:
+        if error is None:
+            self._finish(job, DeliveryJob.COMPLETED, result=result)
+        else:
+            self._finish(job, DeliveryJob.FAILED, error=error)
+    
+    def _finish(self, job: DeliveryJob, state: str, result: Any = None, error: Optional[str] = None) -> None:
+        """Settle a job exactly once; later outcomes (e.g. after a timeout) are dropped"""
+        if job.finished:
+            return
+        if state != DeliveryJob.COMPLETED:
+            job._cancelled.set()
+        job.state, job.result, job.error = state, result, error
+        job.finished_at = time.time()
+        self._active.pop(job.job_id, None)
+        timer = self._timers.pop(job.job_id, None)
+        if timer is not None:
+            timer.stop()
+            timer.deleteLater()
+        if self._journal is not None:
+            self._journal.record_job(job)
+        if state == DeliveryJob.COMPLETED:
+            self.completed.emit(job, result)
+        else:
+            self.failed.emit(job, error or state)
+
+
+def set_widget_state(widget: Optional[QWidget], state: str) -> None:
+    """Flip the "state" property of a widget and repolish only that widget"""
+    if widget is None or widget.property("state") == state:
+        return
+    widget.setProperty("state", state)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
+
+
+class LocationPageGrid(QFrame):
+    """Fixed grid of reusable location buttons.
+    
+    The cells are created and laid out once. Showing a page only swaps the
+    text, bound location and selection state of each cell. Cells are pinned
+    to a fixed size derived from the grid's own size (and re-pinned when the
+    grid is resized or restyled): QPushButton.setText calls updateGeometry(),
+    which invalidates the layout for any widget whose size is not fixed, so
+    this is what keeps page flips to a repaint without a relayout.
+    """
+    location_clicked = Signal(int)  # id of the location bound to the clicked cell
+    page_scrolled = Signal(int)     # +1 / -1 requested by wheel or touchpad scrolling
+    
+    def __init__(self, parent, rows: int = 4, columns: int = 4, button_role: str = "location"):
+        super().__init__(parent)
+        self._columns = columns
+        self._bound_ids: List[int] = []
+        self._slot_by_id: Dict[int, int] = {}
+        self._buttons: List[QPushButton] = []
+        
+        # Qt grid layout for location buttons
+        self._grid_layout = QGridLayout(self)
+        self._grid_layout.setSpacing(20)
+        self._grid_layout.setContentsMargins(0, 0, 0, 0)
+        
+        for slot in range(rows * columns):
+            button = QPushButton("", self)
+            button.setFont(QFont("Montserrat", 45))
+            button.setProperty("role", button_role)
+            policy = button.sizePolicy()
+            policy.setRetainSizeWhenHidden(True)  # keep the cell geometry stable on short pages
+            button.setSizePolicy(policy)
+            button.clicked.connect(lambda _checked=False, s=slot: self._on_cell_clicked(s))
+            button.hide()
+            self._grid_layout.addWidget(button, slot // columns, slot % columns)
+            self._buttons.append(button)
+    
+    @property
+    def grid_layout(self) -> QGridLayout:
+        return self._grid_layout
+    
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._pin_cell_sizes()
+    
+    def changeEvent(self, event) -> None:
+        super().changeEvent(event)
+        if event.type() in (QEvent.StyleChange, QEvent.FontChange):
+            self._pin_cell_sizes()
+    
+    def minimumSizeHint(self) -> QSize:
+        # The pinned cells follow the grid's size, so they must not hold it open
+        layout = self._grid_layout
+        columns, rows = layout.columnCount(), layout.rowCount()
+        cell_height = self._buttons[0].sizeHint().height() if self._buttons else 0
+        width = sum(layout.columnMinimumWidth(c) for c in range(columns)) + layout.horizontalSpacing() * (columns - 1)
+        height = sum(max(layout.rowMinimumHeight(r), cell_height) for r in range(rows)) \
+            + layout.verticalSpacing() * (rows - 1)
+        margins = self.contentsMargins()
+        return QSize(width + margins.left() + margins.right(), height + margins.top() + margins.bottom())
+    
+    def _pin_cell_sizes(self) -> None:
+        """Fix every cell at an equal share of the grid's width and its natural height"""
+        if not self._buttons:
+            return
+        columns = self._columns
+        spacing = self._grid_layout.horizontalSpacing()
+        width = max(0, (self.contentsRect().width() - spacing * (columns - 1)) // columns)
+        size = QSize(width, self._buttons[0].sizeHint().height())
+        for button in self._buttons:
+            if button.minimumSize() != size or button.maximumSize() != size:
+                button.setFixedSize(size)
+    
+    @property
+    def page_size(self) -> int:
+        return len(self._buttons)
+    
+    def bind_page(self, location_ids: List[int], labels: List[str], selected_id: Optional[int] = None,
+                  selected_ids: Collection[int] = ()) -> None:
+        """Bind each cell to a location id and its label; unused cells are hidden
+        
+        Cells showing `selected_id` or any of `selected_ids` are marked selected.
+        """
+        self._bound_ids = list(location_ids)
+        self._slot_by_id = {location_id: slot for slot, location_id in enumerate(self._bound_ids)}
+        for slot, button in enumerate(self._buttons):
+            if slot < len(labels):
+                location_id = self._bound_ids[slot]
+                button.setText(labels[slot])
+                selected = location_id == selected_id or location_id in selected_ids
+                set_widget_state(button, "selected" if selected else "normal")
+                button.show()
+            else:
+                button.hide()
+    
+    def button_for(self, location_id: Optional[int]) -> Optional[QPushButton]:
+        """Return the cell currently showing a location, if it is on this page"""
+        slot = self._slot_by_id.get(location_id)
+        return None if slot is None else self._buttons[slot]
+    
+    def set_selection(self, previous_id: Optional[int], location_id: Optional[int]) -> None:
+        """Move the selection highlight, touching only the two affected cells"""
+        set_widget_state(self.button_for(previous_id), "normal")
+        set_widget_state(self.button_for(location_id), "selected")
+    
+    def set_selected(self, location_id: int, selected: bool) -> None:
+        """Mark one location's cell, if it is on this page, selected or not"""
+        set_widget_state(self.button_for(location_id), "selected" if selected else "normal")
+    
+    def _on_cell_clicked(self, slot: int) -> None:
+        if slot < len(self._bound_ids):
+            self.location_clicked.emit(self._bound_ids[slot])
+    
+    def wheelEvent(self, event) -> None:
+        """Flip pages on scroll for fast navigation"""
+        delta = event.angleDelta().y() or event.angleDelta().x()
+        if delta:
+            self.page_scrolled.emit(-1 if delta > 0 else 1)
+        event.accept()
+
+
 class DeliveryView(BaseView, ThemeableMixin):
     """Delivery view for delivery management"""
     
-    def __init__(self, parent, theme_manager: IThemeManager, app_controller, image_manager=None, **kwargs):
+    @profiled()
+    def __init__(self, parent, theme_manager: IThemeManager, app_controller, image_manager=None,
+                 location_repository: Optional[LocationRepository] = None,
+                 delivery_dispatcher: Optional[DeliveryDispatcher] = None,
+                 delivery_journal: Optional[DeliveryJournal] = None, **kwargs):
         BaseView.__init__(self, parent, **kwargs)
         ThemeableMixin.__init__(self)
         
@@ -29,150 +1886,200 @@ class DeliveryView(BaseView, ThemeableMixin):
         self._theme_manager = theme_manager
         self._app_controller = app_controller
         self._image_manager = image_manager
+        self._location_repository = location_repository or LocationRepository.shared()
+        PROFILER.count_widgets()
+        
+        # Deliveries are handed to the app controller through a job queue; its
+        # start_delivery_process only runs off the GUI thread if marked thread_safe
+        self._delivery_dispatcher = delivery_dispatcher or DeliveryDispatcher(
+            journal=delivery_journal or DeliveryJournal.shared(), parent=self)
+        self._delivery_dispatcher.progress.connect(self._on_delivery_progress)
+        self._delivery_dispatcher.completed.connect(self._on_delivery_completed)
+        self._delivery_dispatcher.failed.connect(self._on_delivery_failed)
+        self._delivery_job: Optional[DeliveryJob] = None
         
         # UI state
         self._current_page = 0
         self._buttons_per_page = 16
         self._max_columns = 4
-        self._all_buttons = []
-        self._current_button = None
+        self._locations = LocationStore(stride=2)
+        self._selected_index: Optional[int] = None
+        self._search_index: Optional[LocationSearchIndex] = None
+        self._spatial_index: Optional[SpatialIndex] = None
+        self._visible_ids: Optional[List[int]] = None  # search result; None shows every location
         self._selected_location = None
         self._goal_location = None
         self._text_status = "Select Table \n Number"
         self._location_selected = False
         self._event_mode = False
+        self._locations_loading = True  # until the repository delivers the first locations
+        self._multi_select = False
+        self._multi_stops: Dict[int, None] = {}  # stop ids in the order they were picked
         
         # Base and return location state
-        self._return_base_location = "/home/pawan/pyside_app/app/Database/event_data.json"
-        self._return_base_location_list = {}
+        self._return_base_location_list: Dict[str, LocationStore] = {}
         self._r_base_name = None
         self._r_base_cord = None
         self._return_loc_status = None
+        self._return_base_chosen = False  # True once the operator picks a base explicitly
+        self._base_spatial_index: Optional[SpatialIndex] = None
+        
+        # Location selection popup, built lazily and reused
+        self.location_popup: Optional[QFrame] = None
+        self._popup_callback: Optional[Callable[[Dict[str, Any]], None]] = None
         
         # Event mode data
         self._event_type = "Birthday"
         self._guest_name = ""
         
+        # Stylesheet compiled for the current theme, applied once to the whole view
+        self._stylesheet_cache: Optional[str] = None
+        
+        # Theme changes requested within one event loop pass are applied once
+        self._theme_update_timer = QTimer(self)
+        self._theme_update_timer.setSingleShot(True)
+        self._theme_update_timer.setInterval(0)
+        self._theme_update_timer.timeout.connect(self._apply_theme_update)
+        
         # Initialize view
         self._setup_theme()
         self._create_ui()
-        self._load_delivery_locations()
-        self._load_return_locations()
+        self._bind_location_repository()
     
-    def _get_themed_stylesheet(self, element_type: str, state: str = "normal") -> str:
-        """Generate a stylesheet string for a themed element."""
-        styles = {
-            "frame": {
-                "normal": f"background-color: {self.get_theme_color('frame_color')}; border-radius: 10px;",
-                "white": f"background-color: {self.get_theme_color('white_frame')}; border-radius: 10px;",
-            },
-            "button": {
-                "normal": f"""
-                    QPushButton {{
-                        background-color: {self.get_theme_color('button_color')};
-                        color: white;
-                        border-radius: 12px;
-                        font-family: 'Montserrat';
-                        font-size: 45px;
-                    }}
-                    QPushButton:hover {{
-                        background-color: {self.get_theme_color('button_hover')};
-                    }}
-                    QPushButton:disabled {{
-                        background-color: #8c8c8c;
-                        color: #cccccc;
-                    }}
-                """,
-                "selected": f"""
-                    QPushButton {{
-                        background-color: {self.get_theme_color('changing_button_fg')};
-                        color: white;
-                        border-radius: 12px;
-                        font-family: 'Montserrat';
-                        font-size: 45px;
-                    }}
-                    QPushButton:hover {{
-                        background-color: {self.get_theme_color('button_hover')};
-                    }}
-                """,
-                "start_delivery": f"""
-                    QPushButton {{
-                        background-color: {self.get_theme_color('button_color')};
-                        color: white;
-                        border-radius: 12px;
-                        font-family: 'Montserrat';
-                        font-size: 55px;
-                    }}
-                    QPushButton:hover {{
-                        background-color: {self.get_theme_color('button_hover')};
-                    }}
-                    QPushButton:disabled {{
-                        background-color: #8c8c8c;
-                        color: #cccccc;
-                    }}
-                """,
-                "nav_button": f"""
-                    QPushButton {{
-                        background-color: {self.get_theme_color('button_color')};
-                        color: white;
-                        border-radius: 8px;
-                        font-family: 'Montserrat';
-                        font-size: 40px;
-                    }}
-                    QPushButton:hover {{
-                        background-color: {self.get_theme_color('button_hover')};
-                    }}
-                """,
-                "edit_button": f"""
-                    QPushButton {{
-                        background-color: {self.get_theme_color('button_hover')};
-                        color: white;
-                        border-radius: 8px;
-                        font-family: 'Montserrat';
-                        font-size: 25px;
-                    }}
-                    QPushButton:hover {{
-                        background-color: {self.get_theme_color('button_color')};
-                    }}
-                """,
-                "base_event_button": f"""
-                    QPushButton {{
-                        background-color: {self.get_theme_color('button_color')};
-                        color: white;
-                        border-radius: 20px;
-                        font-family: 'Montserrat';
-                        font-size: 30px;
-                    }}
-                    QPushButton:hover {{
-                        background-color: {self.get_theme_color('button_hover')};
-                    }}
-                """
-            },
-            "label": {
-                "heading": f"color: {self.get_theme_color('grey_font_color')};",
-                "normal": f"color: {self.get_theme_color('text_color')};",
-                "selected": f"color: white;",
-            }
-        }
-        return styles.get(element_type, {}).get(state, "")
+    def _get_view_stylesheet(self) -> str:
+        """Return the cached stylesheet for the whole view."""
+        if self._stylesheet_cache is None:
+            self._stylesheet_cache = self._build_view_stylesheet()
+        return self._stylesheet_cache
+    
+    def _build_view_stylesheet(self) -> str:
+        """Compile the single view stylesheet for the current theme colors.
+        
+        Widgets are matched by their "role" dynamic property and switch looks
+        through a "state" property, so no widget needs its own stylesheet.
+        """
+        button_color = self.get_theme_color('button_color')
+        button_hover = self.get_theme_color('button_hover')
+        selected_color = self.get_theme_color('changing_button_fg')
+        frame_color = self.get_theme_color('frame_color')
+        white_frame = self.get_theme_color('white_frame')
+        return f"""
+            QFrame[role="frame"] {{ background-color: {frame_color}; border-radius: 10px; }}
+            QFrame[role="white"] {{ background-color: {white_frame}; border-radius: 10px; }}
+            QFrame[role="lower"] {{ background-color: {white_frame}; border-radius: 12px; }}
+            QFrame[role="location_display"] {{ background-color: {frame_color}; border-radius: 20px; }}
+            QFrame[role="location_display"][state="selected"] {{ background-color: {selected_color}; }}
+            QFrame[role="return_location"] {{ background-color: {button_color}; border-radius: 10px; }}
+            QFrame[role="location_grid"] {{ background-color: transparent; }}
+            QFrame[role="popup_grid"] {{ background-color: white; }}
+            
+            QLabel[role="heading"] {{ color: {self.get_theme_color('grey_font_color')}; }}
+            QLabel[role="normal"] {{ color: {self.get_theme_color('text_color')}; }}
+            QLabel[state="selected"] {{ color: white; }}
+            
+            QLineEdit[role="search"] {{
+                background-color: {frame_color};
+                color: {self.get_theme_color('text_color')};
+                border-radius: 10px;
+                padding: 5px 15px;
+                font-family: 'Montserrat';
+                font-size: 30px;
+            }}
+            
+            QPushButton[role="location"], QPushButton[role="popup_location"] {{
+                background-color: {button_color};
+                color: white;
+                border-radius: 12px;
+                font-family: 'Montserrat';
+                font-size: 45px;
+            }}
+            QPushButton[role="location"][state="selected"] {{ background-color: {selected_color}; }}
+            QPushButton[role="popup_location"][state="selected"] {{ background-color: #4DA6FF; }}
+            QPushButton[role="location"]:hover, QPushButton[role="popup_location"]:hover {{
+                background-color: {button_hover};
+            }}
+            QPushButton[role="location"]:disabled {{
+                background-color: #8c8c8c;
+                color: #cccccc;
+            }}
+            
+            QPushButton[role="start_delivery"], QPushButton[role="popup_confirm"] {{
+                background-color: {button_color};
+                color: white;
+                border-radius: 12px;
+                font-family: 'Montserrat';
+                font-size: 55px;
+            }}
+            QPushButton[role="start_delivery"][state="active"] {{ background-color: #1a75ff; }}
+            QPushButton[role="popup_confirm"] {{ background-color: #4DA6FF; }}
+            QPushButton[role="start_delivery"]:hover, QPushButton[role="popup_confirm"]:hover {{
+                background-color: {button_hover};
+            }}
+            QPushButton[role="start_delivery"]:disabled, QPushButton[role="popup_confirm"]:disabled {{
+                background-color: #8c8c8c;
+                color: #cccccc;
+            }}
+            QPushButton[role="start_delivery"][state="busy"]:disabled {{
+                background-color: #1a75ff;
+                color: white;
+            }}
+            
+            QPushButton[role="nav_button"] {{
+                background-color: {button_color};
+                color: white;
+                border-radius: 8px;
+                font-family: 'Montserrat';
+                font-size: 40px;
+            }}
+            QPushButton[role="nav_button"]:hover {{ background-color: {button_hover}; }}
+            
+            QPushButton[role="edit_button"] {{
+                background-color: {button_hover};
+                color: white;
+                border-radius: 8px;
+                font-family: 'Montserrat';
+                font-size: 25px;
+            }}
+            QPushButton[role="edit_button"]:hover {{ background-color: {button_color}; }}
+            
+            QPushButton[role="base_event_button"] {{
+                background-color: {button_color};
+                color: white;
+                border-radius: 20px;
+                font-family: 'Montserrat';
+                font-size: 30px;
+            }}
+            QPushButton[role="base_event_button"]:hover {{ background-color: {button_hover}; }}
+            QPushButton[role="base_event_button"][state="active"] {{ background-color: {selected_color}; }}
+            
+            QPushButton[role="return_location"] {{
+                background-color: {button_color};
+                color: white;
+                border-radius: 0px;
+            }}
+        """
     
+    @profiled()
     def _setup_theme(self) -> None:
         """Set up theme colors"""
         theme_colors = self._theme_manager.get_current_theme()
         self.set_theme_colors(theme_colors)
-        
-        # Apply theme to main_frame and upper_frame if they exist
-        if hasattr(self, 'main_frame'):
-            self.main_frame.setStyleSheet(self._get_themed_stylesheet("frame", "white"))
-        if hasattr(self, 'upper_frame'):
-            self.upper_frame.setStyleSheet(self._get_themed_stylesheet("frame"))   
+        self._stylesheet_cache = None  # recompiled for the new colors
+        
+        # One stylesheet for the whole view; children are matched by role.
+        # Re-applying an identical sheet would still repolish every child.
+        stylesheet = self._get_view_stylesheet()
+        if stylesheet != self.styleSheet():
+            self.setStyleSheet(stylesheet)
+            PROFILER.count("setStyleSheet")
             
              
+    @profiled()
     def _create_ui(self) -> None:
         """Create the user interface"""
         # Main container
         self.main_frame = QFrame(self)
-        self.main_frame.setStyleSheet(self._get_themed_stylesheet("frame", "white"))
+        self.main_frame.setProperty("role", "white")
         
         # using VBoxLayout to remove any borders from the main_frame
         outer_layout = QVBoxLayout(self)
@@ -214,7 +2121,7 @@ class DeliveryView(BaseView, ThemeableMixin):
     def _create_upper_frame(self) -> None:
         """Create the upper frame with title and back button"""
         self.upper_frame = QFrame(self.main_frame)
-        self.upper_frame.setStyleSheet(self._get_themed_stylesheet("frame"))
+        self.upper_frame.setProperty("role", "frame")
         self.upper_frame.setFixedHeight(120) #fixed height of header
         # Add to main vertical layout instead of relying on geometry
         if hasattr(self, 'main_layout'):
@@ -233,7 +2140,7 @@ class DeliveryView(BaseView, ThemeableMixin):
         # size of the button widget
         self.back_button.setFixedSize(60, 60)
 
-        self.back_button.setStyleSheet(self._get_themed_stylesheet("button", "nav_button"))
+        self.back_button.setProperty("role", "nav_button")
         self.back_button.clicked.connect(self._on_back) # connect to the slot on_back 
         header_layout.addWidget(self.back_button)  # add button to the hboxlayout
         header_layout.addStretch(1)
@@ -241,7 +2148,7 @@ class DeliveryView(BaseView, ThemeableMixin):
         # Title label
         self.title_label = QLabel("Delivery Mode", self.upper_frame)
         self.title_label.setFont(QFont("Montserrat", 30, QFont.Bold))
-        self.title_label.setStyleSheet(self._get_themed_stylesheet("label", "heading"))
+        self.title_label.setProperty("role", "heading")
         # self.title_label.setAlignment(Qt.AlignCenter) # Center the title
         self.title_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
         header_layout.addWidget(self.title_label)  # add label to the hboxlayout
@@ -254,7 +2161,7 @@ class DeliveryView(BaseView, ThemeableMixin):
         """Create the button section with location buttons and navigation"""
         # Button container frame
         self.button_container_frame = QFrame(self.main_frame)
-        self.button_container_frame.setStyleSheet(self._get_themed_stylesheet("frame", "white"))
+        self.button_container_frame.setProperty("role", "white")
         self.button_container_frame.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         
         # Use a vertical layout inside the container
@@ -262,15 +2169,22 @@ class DeliveryView(BaseView, ThemeableMixin):
         self.button_container_layout.setContentsMargins(20, 20, 20, 20)
         self.button_container_layout.setSpacing(0)
         
-        # Button frame for location buttons
-        self.button_frame = QFrame(self.button_container_frame)
-        self.button_frame.setStyleSheet("background-color: transparent;")
+        # Search box filtering the grid as the user types
+        self.search_box = QLineEdit(self.button_container_frame)
+        self.search_box.setPlaceholderText("Search locations")
+        self.search_box.setFixedHeight(60)
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.setProperty("role", "search")
+        self.search_box.textChanged.connect(self._on_search_changed)
+        self.button_container_layout.addWidget(self.search_box)
+        self.button_container_layout.addSpacing(20)
+        
+        # Button frame for location buttons; cells are created once and rebound per page
+        self.button_frame = LocationPageGrid(self.button_container_frame, self._buttons_per_page // self._max_columns, self._max_columns)
+        self.button_frame.setProperty("role", "location_grid")
         self.button_frame.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        
-        # Qt grid layout for location buttons
-        self.button_grid_layout = QGridLayout(self.button_frame)
-        self.button_grid_layout.setSpacing(20)
-        self.button_grid_layout.setContentsMargins(0, 0, 0, 0)
+        self.button_frame.location_clicked.connect(self._on_location_click)
+        self.button_frame.page_scrolled.connect(self._on_page_scrolled)
         
         # Add the grid frame to the container layout - takes all space
         self.button_container_layout.addWidget(self.button_frame, 1)
@@ -282,13 +2196,13 @@ class DeliveryView(BaseView, ThemeableMixin):
         
         self.prev_page_button = QPushButton("<", self.button_container_frame)
         self.prev_page_button.setFixedSize(70, 70)
-        self.prev_page_button.setStyleSheet(self._get_themed_stylesheet("button", "nav_button"))
+        self.prev_page_button.setProperty("role", "nav_button")
         self.prev_page_button.clicked.connect(self._prev_page)
         nav_row.addWidget(self.prev_page_button)
         
         self.next_page_button = QPushButton(">", self.button_container_frame)
         self.next_page_button.setFixedSize(70, 70)
-        self.next_page_button.setStyleSheet(self._get_themed_stylesheet("button", "nav_button"))
+        self.next_page_button.setProperty("role", "nav_button")
         self.next_page_button.clicked.connect(self._next_page)
         nav_row.addWidget(self.next_page_button)
         
@@ -300,7 +2214,7 @@ class DeliveryView(BaseView, ThemeableMixin):
         """Create the info section with location display and action buttons"""
         # Info frame
         self.info_frame = QFrame(self.main_frame)
-        self.info_frame.setStyleSheet(self._get_themed_stylesheet("frame", "white"))
+        self.info_frame.setProperty("role", "white")
         self.info_frame.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Expanding)
         self.info_frame.setMinimumWidth(300)  # Ensure minimum width for left panel
         
@@ -311,9 +2225,7 @@ class DeliveryView(BaseView, ThemeableMixin):
         
         # COMPONENT 1: Location display frame (Select Table Number)
         self.location_display_frame = QFrame(self.info_frame)
-        self.location_display_frame.setStyleSheet(
-            f"background-color: {self.get_theme_color('frame_color')}; border-radius: 20px;"
-        )
+        self.location_display_frame.setProperty("role", "location_display")
         self.location_display_frame.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         
         # Layout for location display frame
@@ -324,7 +2236,7 @@ class DeliveryView(BaseView, ThemeableMixin):
         # Location label 
         self.location_label = QLabel(self._text_status, self.location_display_frame)
         self.location_label.setFont(QFont("Montserrat", 32, QFont.Bold))
-        self.location_label.setStyleSheet(self._get_themed_stylesheet("label", "heading"))
+        self.location_label.setProperty("role", "heading")
         self.location_label.setAlignment(Qt.AlignCenter)
         self.location_label.setWordWrap(True)
         location_display_layout.addWidget(self.location_label)
@@ -339,9 +2251,7 @@ class DeliveryView(BaseView, ThemeableMixin):
         
         # COMPONENT 3: Action buttons frame (Base/Event buttons)
         self.action_buttons_frame = QFrame(self.info_frame)
-        self.action_buttons_frame.setStyleSheet(
-            f"background-color: {self.get_theme_color('white_frame')}; border-radius: 10px;"
-        )
+        self.action_buttons_frame.setProperty("role", "white")
         self.action_buttons_frame.setFixedHeight(90)
         self.action_buttons_frame.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         
@@ -353,7 +2263,7 @@ class DeliveryView(BaseView, ThemeableMixin):
         self.base_button = QPushButton("Base", self.action_buttons_frame)
         self.base_button.setFixedHeight(70)
         self.base_button.setFont(QFont("Montserrat", 28))
-        self.base_button.setStyleSheet(self._get_themed_stylesheet("button", "base_event_button"))
+        self.base_button.setProperty("role", "base_event_button")
         self.base_button.clicked.connect(self._on_base_mode)
         action_buttons_layout.addWidget(self.base_button)
 
@@ -361,19 +2271,25 @@ class DeliveryView(BaseView, ThemeableMixin):
         self.event_button = QPushButton("Event", self.action_buttons_frame)
         self.event_button.setFixedHeight(70)
         self.event_button.setFont(QFont("Montserrat", 28))
-        self.event_button.setStyleSheet(self._get_themed_stylesheet("button", "base_event_button"))
+        self.event_button.setProperty("role", "base_event_button")
         # self.event_button.clicked.connect(self._on_event_mode)
         action_buttons_layout.addWidget(self.event_button)
         
+        # Multi-stop button: pick several tables for one trip
+        self.multi_button = QPushButton("Multi", self.action_buttons_frame)
+        self.multi_button.setFixedHeight(70)
+        self.multi_button.setFont(QFont("Montserrat", 28))
+        self.multi_button.setProperty("role", "base_event_button")
+        self.multi_button.clicked.connect(self._on_multi_mode)
+        action_buttons_layout.addWidget(self.multi_button)
+        
         self.info_layout.addWidget(self.action_buttons_frame)
 
     
     def _create_lower_frame(self) -> None:
         """Create the lower frame with start button"""
         self.lower_frame = QFrame(self.main_frame)
-        self.lower_frame.setStyleSheet(
-            f"background-color: {self.get_theme_color('white_frame')}; border-radius: 12px;"
-        )
+        self.lower_frame.setProperty("role", "lower")
         self.lower_frame.setFixedHeight(100)  # Fixed height for consistency
         self.lower_frame.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         
@@ -386,7 +2302,7 @@ class DeliveryView(BaseView, ThemeableMixin):
         self.start_button = QPushButton("Start Delivery", self.lower_frame)
         self.start_button.setFixedHeight(70)
         self.start_button.setFont(QFont("Montserrat", 48))
-        self.start_button.setStyleSheet(self._get_themed_stylesheet("button", "start_delivery"))
+        self.start_button.setProperty("role", "start_delivery")
         self.start_button.clicked.connect(self._on_start_delivery)
         self.start_button.setEnabled(False)
         self.start_button.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
@@ -399,7 +2315,7 @@ class DeliveryView(BaseView, ThemeableMixin):
         #     self.middle_frame,
         # )
         self.return_location_frame = QFrame(self.info_frame)
-        self.return_location_frame.setStyleSheet(f"background-color: {self.get_theme_color('button_color')}; border-radius: 10px;")
+        self.return_location_frame.setProperty("role", "return_location")
         
         return_location_layout = QHBoxLayout(self.return_location_frame)
         return_location_layout.setContentsMargins(10, 5, 10, 5)
@@ -408,7 +2324,7 @@ class DeliveryView(BaseView, ThemeableMixin):
         
         self.return_location_button = QPushButton("Return to Base", self.return_location_frame)
         self.return_location_button.setFont(QFont("Montserrat", 28))
-        self.return_location_button.setStyleSheet(f"background-color: {self.get_theme_color('button_color')}; color: white; border-radius: 0px;")
+        self.return_location_button.setProperty("role", "return_location")
         self.return_location_button.clicked.connect(self._on_return_location)
         
         return_location_layout.addWidget(self.return_location_button, 4) # Give it more stretch
@@ -416,7 +2332,7 @@ class DeliveryView(BaseView, ThemeableMixin):
         # Edit button for return location
         self.return_edit_button = QPushButton("Edit", self.return_location_frame)
         self.return_edit_button.setFont(QFont("Montserrat", 25))
-        self.return_edit_button.setStyleSheet(self._get_themed_stylesheet("button", "edit_button"))
+        self.return_edit_button.setProperty("role", "edit_button")
         self.return_edit_button.setFixedSize(60, 40) # Smaller fixed size for edit button
         self.return_edit_button.clicked.connect(self._on_return_location)
         return_location_layout.addWidget(self.return_edit_button, 1) # Give it less stretch
@@ -426,165 +2342,354 @@ class DeliveryView(BaseView, ThemeableMixin):
         # or install an event filter. For simplicity, connecting button clicks is often sufficient.
         # self.return_location_frame.mousePressEvent = lambda event: self._on_return_location()
     
-    def _load_delivery_locations(self) -> None:
-        """Load delivery locations from file"""
-        try:
-            delivery_file = "/home/pawan/pyside_app/Database/delivery_location.json"
-            if os.path.exists(delivery_file):
-                with open(delivery_file, "r") as f:
-                    data = json.load(f)
-                    locations = data.get("Delivery_Location", [])
-                    # 
-                    self._create_location_buttons(locations)
+    @profiled()
+    def _bind_location_repository(self) -> None:
+        """Follow the shared location repository, taking over whatever it already holds"""
+        repository = self._location_repository
+        repository.delivery_batch.connect(self._on_locations_streamed)
+        repository.delivery_loaded.connect(self._on_delivery_locations_loaded)
+        repository.delivery_changed.connect(self._apply_location_diff)
+        repository.return_changed.connect(self._on_return_locations_changed)
+        
+        if repository.delivery_ready:
+            self._on_delivery_locations_loaded()
+        elif len(repository.delivery_locations):
+            # Another page started the load; show what has streamed in so far
+            self._on_locations_streamed(LocationStore(stride=2))
+        else:
+            self._update_location_display()
+            self._display_buttons_page(0)
+        if repository.return_ready:
+            self._on_return_locations_changed()
+        repository.load()
+    
+    def _unbind_location_repository(self) -> None:
+        repository = self._location_repository
+        for signal, slot in ((repository.delivery_batch, self._on_locations_streamed),
+                             (repository.delivery_loaded, self._on_delivery_locations_loaded),
+                             (repository.delivery_changed, self._apply_location_diff),
+                             (repository.return_changed, self._on_return_locations_changed)):
+            try:
+                signal.disconnect(slot)
+            except (RuntimeError, TypeError):
+                pass
+    
+    def _on_locations_streamed(self, batch: LocationStore) -> None:
+        """Show delivery locations as the repository streams them in"""
+        locations = self._location_repository.delivery_locations
+        if self._locations_loading or self._locations is not locations:
+            # First batch of a load: show its page right away, indexes follow at the end
+            self._locations_loading = False
+            self._locations = locations
+            self._search_index = None
+            self._spatial_index = None
+            self._visible_ids = None
+            self._current_page = 0
+            # Ids from the previous store mean nothing in this one
+            self._clear_selection()
+            self._display_buttons_page(0)
+            return
+        page_end = (self._current_page + 1) * self._buttons_per_page
+        page_was_full = len(locations) - len(batch) >= page_end
+        if page_was_full:
+            self.next_page_button.setEnabled(True)
+        else:
+            self._display_buttons_page(self._current_page)
+    
+    @profiled()
+    def _on_delivery_locations_loaded(self) -> None:
+        """Attach the indexes once the repository has finished loading"""
+        repository = self._location_repository
+        if self._locations_loading or self._locations is not repository.delivery_locations:
+            self._apply_delivery_locations(repository.delivery_locations, repository.search_index,
+                                           repository.spatial_index)
+            return
+        self._search_index = repository.search_index
+        self._spatial_index = repository.spatial_index
+        # Apply anything typed into the search box while the file was streaming
+        if self.search_box.text():
+            self._on_search_changed(self.search_box.text())
+    
+    @profiled()
+    def _apply_location_diff(self, diff: LocationDiff) -> None:
+        """Swap in reloaded delivery locations, keeping the page and selection"""
+        repository = self._location_repository
+        if self._locations_loading:
+            self._on_delivery_locations_loaded()
+            return
+        locations = repository.delivery_locations
+        self._locations = locations
+        self._search_index = repository.search_index
+        self._spatial_index = repository.spatial_index
+        
+        # Follow the selected location to its new id, or drop it if it is gone
+        selection_changed = False
+        if self._selected_index is not None:
+            new_index = diff.id_map.get(self._selected_index)
+            selection_changed = new_index is None or new_index in diff.changed
+            if new_index is None:
+                self._clear_selection()
             else:
-                # Create default locations if file doesn't exist
-                default_locations = [
-                    {"name": "Table 1", "cordinates": [0.0, 0.0]},
-                    {"name": "Table 2", "cordinates": [1.0, 0.0]},
-                    {"name": "Table 3", "cordinates": [2.0, 0.0]},
-                    {"name": "Table 4", "cordinates": [0.0, 1.0]},
-                    {"name": "Table 5", "cordinates": [1.0, 1.0]},
-                    {"name": "Table 6", "cordinates": [2.0, 1.0]}
-                ]
-                self._create_location_buttons(default_locations)
-        except Exception as e:
-            print(f"Error loading delivery locations: {e}")
-            # Create fallback buttons
-            self._create_location_buttons([])
+                self._selected_index = new_index
+                self._selected_location = locations.location(new_index)
+                self._goal_location = self._selected_location["cordinates"]
+        if self._multi_stops:
+            stops = {diff.id_map[i]: None for i in self._multi_stops if i in diff.id_map}
+            selection_changed = selection_changed or len(stops) != len(self._multi_stops)
+            self._multi_stops = stops
+            self._update_multi_stop_status()
+        
+        self._visible_ids = self._search_index.search(self.search_box.text())
+        last_page = max(0, (self._visible_count() - 1) // self._buttons_per_page)
+        self._current_page = min(self._current_page, last_page)
+        # The pooled cells only repaint where their text or state actually differs
+        self._display_buttons_page(self._current_page)
+        self._update_location_display()
+        if selection_changed:
+            self._update_start_button()
     
-    def _load_return_locations(self) -> None:
-        """Load return/base locations from file"""
-        try:
-            if os.path.exists(self._return_base_location):
-                with open(self._return_base_location, "r") as f:
-                    self._return_base_location_list = json.load(f)
+    def _on_return_locations_changed(self) -> None:
+        repository = self._location_repository
+        self._apply_return_locations(repository.return_locations, repository.base_spatial_index)
+    
+    def _apply_delivery_locations(self, locations: LocationStore,
+                                  search_index: Optional[LocationSearchIndex] = None,
+                                  spatial_index: Optional[SpatialIndex] = None) -> None:
+        """Populate the grid from prepared delivery locations"""
+        self._locations_loading = False
+        self._create_location_buttons(locations, search_index, spatial_index)
+        self._update_location_display()
+    
+    def _apply_return_locations(self, stores: Dict[str, LocationStore], spatial_index: SpatialIndex) -> None:
+        """Store prepared return/base location data"""
+        self._return_base_location_list = stores
+        self._base_spatial_index = spatial_index
+        
+        # After a reload, follow the current base to its new coordinates or drop it
+        if self._r_base_name:
+            for key in ("Base_Locations", "Default_Base_Loc"):
+                base_id = stores[key].find(self._r_base_name)
+                if base_id is not None:
+                    self._r_base_cord = stores[key].cordinates(base_id)
+                    break
             else:
-                # Create default base locations if file doesn't exist
-                self._return_base_location_list = {
-                    "Base_Locations": [
-                        {"name": "Base 1", "cordinates": [0.0, 0.0, 0.0, 0.0, 0.0, 1.0]},
-                        {"name": "Base 2", "cordinates": [1.0, 0.0, 0.0, 0.0, 0.0, 1.0]},
-                        {"name": "Base 3", "cordinates": [2.0, 0.0, 0.0, 0.0, 0.0, 1.0]}
-                    ],
-                    "Default_Base_Loc": [
-                        {"name": "Base 1", "cordinates": [0.0, 0.0, 0.0, 0.0, 0.0, 1.0]}
-                    ]
-                }
-        except Exception as e:
-            print(f"Error loading return locations: {e}")
-            self._return_base_location_list = {}
+                self._r_base_name = None
+                self._r_base_cord = None
+                self._return_base_chosen = False
         
         # Set default return location
         self._update_return_location_display()
     
-    def _create_location_buttons(self, locations: List[Dict[str, Any]]) -> None:
-        """Create location buttons"""
-        # Clear existing buttons
-        for button in self._all_buttons:
-            try:
-                button.setParent(None)
-                button.deleteLater()
-            except Exception:
-                pass
-        self._all_buttons.clear()
-        
-        # Create new buttons
-        for location in locations:
-            button = QPushButton(location.get("name", "Unknown"), self.button_frame)
-            button.setFont(QFont("Montserrat", 45))
-            button.setStyleSheet(self._get_themed_stylesheet("button"))
-            button.clicked.connect(lambda loc=location: self._on_location_click(loc))
-            self._all_buttons.append(button)
+    def _create_location_buttons(self, locations: LocationStore,
+                                 search_index: Optional[LocationSearchIndex] = None,
+                                 spatial_index: Optional[SpatialIndex] = None) -> None:
+        """Bind a new set of locations to the button pool"""
+        self._locations = locations
+        self._search_index = search_index or LocationSearchIndex(locations.names())
+        self._spatial_index = spatial_index or SpatialIndex(locations.iter_cordinates())
+        self._clear_selection()
+        
+        # Keep any query the user already typed
+        self._visible_ids = self._search_index.search(self.search_box.text())
+        self._current_page = 0
         
         # Display first page
         self._display_buttons_page(0)
     
+    def _visible_count(self) -> int:
+        """Number of locations passing the current search filter"""
+        return len(self._locations) if self._visible_ids is None else len(self._visible_ids)
+    
+    @profiled()
     def _display_buttons_page(self, page_num: int) -> None:
         """Display buttons for the current page"""
-        # Clear current widgets from grid layout
-        if hasattr(self, 'button_grid_layout'):
-            while self.button_grid_layout.count():
-                item = self.button_grid_layout.takeAt(0)
-                w = item.widget()
-                if w:
-                    w.hide()
-        
         start_index = page_num * self._buttons_per_page
-        end_index = start_index + self._buttons_per_page
-        buttons_to_display = self._all_buttons[start_index:end_index]
+        end_index = min(start_index + self._buttons_per_page, self._visible_count())
         
-        # Add buttons to the grid layout for the current page
-        for i, button in enumerate(buttons_to_display):
-            row = i // self._max_columns
-            column = i % self._max_columns
-            self.button_grid_layout.addWidget(button, row, column)
-            button.show()
+        # Rebind the grid cells to the locations on this page
+        if self._visible_ids is None:
+            location_ids = range(start_index, end_index)
+        else:
+            location_ids = self._visible_ids[start_index:end_index]
+        labels = [self._locations.name(i) for i in location_ids]
+        self.button_frame.bind_page(location_ids, labels, self._selected_index, self._multi_stops)
         
         # Update navigation button states
         self.prev_page_button.setEnabled(page_num > 0)
-        self.next_page_button.setEnabled((page_num + 1) * self._buttons_per_page < len(self._all_buttons))
+        self.next_page_button.setEnabled((page_num + 1) * self._buttons_per_page < self._visible_count())
+    
+    @profiled()
+    def _on_search_changed(self, text: str) -> None:
+        """Filter the grid to locations matching the search box"""
+        if self._search_index is None:
+            return
+        self._visible_ids = self._search_index.search(text)
+        self._current_page = 0
+        self._display_buttons_page(0)
     
+    @profiled()
     def _prev_page(self) -> None:
         """Go to previous page"""
         if self._current_page > 0:
             self._current_page -= 1
             self._display_buttons_page(self._current_page)
     
+    @profiled()
     def _next_page(self) -> None:
         """Go to next page"""
-        if (self._current_page + 1) * self._buttons_per_page < len(self._all_buttons):
+        if (self._current_page + 1) * self._buttons_per_page < self._visible_count():
             self._current_page += 1
             self._display_buttons_page(self._current_page)
     
-    def _on_location_click(self, location: Dict[str, Any]) -> None:
+    def _on_page_scrolled(self, step: int) -> None:
+        """Handle scroll navigation over the location grid"""
+        if step > 0:
+            self._next_page()
+        else:
+            self._prev_page()
+    
+    @profiled()
+    def _on_location_click(self, index: int) -> None:
         """Handle location button click"""
-        # Reset all buttons to default color first
-        for button in self._all_buttons:
-            button.setStyleSheet(self._get_themed_stylesheet("button"))
-        
-        # Find and update the clicked button
-        for button in self._all_buttons:
-            if button.text() == location.get("name"):
-                if button == self._current_button:
-                    # Deselect if same button clicked
-                    self._current_button = None
-                    self._selected_location = None
-                    self._location_selected = False
-                    self._text_status = "Select Table \n Number"
-                else:
-                    # Select new button
-                    button.setStyleSheet(self._get_themed_stylesheet("button", "selected"))  # Highlight color
-                    self._current_button = button
-                    self._selected_location = location
-                    self._goal_location = location.get("cordinates")
-                    self._location_selected = True
-                    self._text_status = location.get("name", "Unknown")
-                break
+        if self._multi_select:
+            self._toggle_stop(index)
+            return
+        previous_index = self._selected_index
+        if index == self._selected_index:
+            # Deselect if same location clicked
+            self._clear_selection()
+        else:
+            # Select new location
+            self._selected_index = index
+            self._selected_location = self._locations.location(index)
+            self._goal_location = self._selected_location["cordinates"]
+            self._location_selected = True
+            self._text_status = self._selected_location["name"]
+            self._auto_select_return_base()
+        
+        # Restyle only the previously and newly selected buttons
+        self.button_frame.set_selection(previous_index, self._selected_index)
         
         # Update UI
         self._update_location_display()
         self._update_start_button()
     
+    def _on_multi_mode(self) -> None:
+        """Switch between single and multi-stop selection"""
+        self._multi_select = not self._multi_select
+        set_widget_state(self.multi_button, "active" if self._multi_select else "normal")
+        # The current table carries over as the first stop, and back again
+        if self._multi_select:
+            self._multi_stops = {} if self._selected_index is None else {self._selected_index: None}
+            self._selected_index = None
+            self._update_multi_stop_status()
+        else:
+            first = next(iter(self._multi_stops), None)
+            self._multi_stops = {}
+            if first is None:
+                self._clear_selection()
+            else:
+                self._selected_index = first
+                self._selected_location = self._locations.location(first)
+                self._goal_location = self._selected_location["cordinates"]
+                self._location_selected = True
+                self._text_status = self._selected_location["name"]
+        self._display_buttons_page(self._current_page)
+        self._update_location_display()
+        self._update_start_button()
+    
+    def _toggle_stop(self, index: int) -> None:
+        """Add or remove a table from the multi-stop trip"""
+        if index in self._multi_stops:
+            del self._multi_stops[index]
+        else:
+            self._multi_stops[index] = None
+        self.button_frame.set_selected(index, index in self._multi_stops)
+        self._update_multi_stop_status()
+        if len(self._multi_stops) == 1:
+            self._auto_select_return_base()
+        self._update_location_display()
+        self._update_start_button()
+    
+    def _update_multi_stop_status(self) -> None:
+        """Derive the selection summary from the picked stops"""
+        first = next(iter(self._multi_stops), None)
+        self._location_selected = first is not None
+        self._selected_location = None if first is None else self._locations.location(first)
+        self._goal_location = None if first is None else self._selected_location["cordinates"]
+        count = len(self._multi_stops)
+        self._text_status = "Select \n Tables" if not count else f"{count} Stop{'s' if count > 1 else ''}"
+    
+    def _route_stops(self) -> List[int]:
+        """Picked stops in driving order, ending at the return base
+        
+        Stops without coordinates cannot be placed on the route and follow
+        the others in the order they were picked.
+        """
+        placed, unplaced, points = [], [], []
+        for stop in self._multi_stops:
+            cordinates = self._locations.cordinates(stop)
+            if cordinates and len(cordinates) >= 2:
+                placed.append(stop)
+                points.append((cordinates[0], cordinates[1]))
+            else:
+                unplaced.append(stop)
+        end = tuple(self._r_base_cord[:2]) if self._r_base_cord and len(self._r_base_cord) >= 2 else None
+        return [placed[i] for i in order_route_stops(points, end)] + unplaced
+    
+    def _nearest_bases(self, cordinates: Optional[List[float]], count: int) -> List[int]:
+        """Return up to `count` base ids ordered by distance from `cordinates`"""
+        if self._base_spatial_index is None or not cordinates or len(cordinates) < 2:
+            return []
+        return self._base_spatial_index.nearest(cordinates[0], cordinates[1], count)
+    
+    def _auto_select_return_base(self) -> None:
+        """Default the return base to the one closest to the selected location
+        
+        Only applies while the operator has not picked a base and the base file
+        does not name a default of its own.
+        """
+        if self._return_base_chosen or len(self._return_base_location_list.get("Default_Base_Loc", ())):
+            return
+        nearest = self._nearest_bases(self._goal_location, 1)
+        if nearest:
+            bases = self._return_base_location_list["Base_Locations"]
+            self._r_base_name = bases.name(nearest[0])
+            self._r_base_cord = bases.cordinates(nearest[0])
+            self._update_return_location_display()
+    
+    def _clear_selection(self) -> None:
+        """Drop the selected location and any picked stops, and refresh the controls"""
+        self._selected_index = None
+        self._multi_stops = {}
+        self._selected_location = None
+        self._goal_location = None
+        self._location_selected = False
+        self._text_status = "Select \n Tables" if self._multi_select else "Select Table \n Number"
+        self._update_location_display()
+        self._update_start_button()
+    
     def _update_location_display(self) -> None:
         """Update location display"""
         if hasattr(self, 'location_label'):
-            self.location_label.setText(self._text_status)
+            # Placeholder until the background loader delivers the locations
+            self.location_label.setText("Loading \n Locations..." if self._locations_loading else self._text_status)
             
             # Update frame color based on selection
-            if self._location_selected:
-                self.location_display_frame.setStyleSheet(f"background-color: {self.get_theme_color('changing_button_fg')}; border-radius: 20px;")
-                self.location_label.setStyleSheet(self._get_themed_stylesheet("label", "selected"))
-            else:
-                self.location_display_frame.setStyleSheet(f"background-color: {self.get_theme_color('frame_color')}; border-radius: 20px;")
-                self.location_label.setStyleSheet(self._get_themed_stylesheet("label", "heading"))
+            state = "selected" if self._location_selected else "normal"
+            set_widget_state(self.location_display_frame, state)
+            set_widget_state(self.location_label, state)
     
     def _update_start_button(self) -> None:
         """Update start button state"""
+        if self._delivery_job is not None:
+            # A delivery is being dispatched; the button shows it until it settles
+            self.start_button.setEnabled(False)
+            set_widget_state(self.start_button, "busy")
+            return
+        self.start_button.setText("Start Delivery")
         self.start_button.setEnabled(bool(self._location_selected))
-        if self._location_selected:
-            self.start_button.setStyleSheet(self._get_themed_stylesheet("button", "start_delivery").replace(self.get_theme_color('button_color'), "#1a75ff"))
-        else:
-            self.start_button.setStyleSheet(self._get_themed_stylesheet("button", "start_delivery"))
+        set_widget_state(self.start_button, "active" if self._location_selected else "normal")
     
     def _on_base_mode(self) -> None:
         """Handle base mode button click"""
@@ -594,21 +2699,58 @@ class DeliveryView(BaseView, ThemeableMixin):
         """Handle return location button click"""
         self._show_return_location_selection()
     
+    @profiled()
     def _on_start_delivery(self) -> None:
         """Handle start delivery button click"""
-        if self._location_selected and self._selected_location:
+        # A single delivery needs a selected id; a stale flag alone is not enough
+        has_target = self._multi_stops if self._multi_select else self._selected_index is not None
+        if self._location_selected and self._selected_location and has_target:
             if self._app_controller:
                 # Start delivery process
-                delivery_data = {
-                    "location": self._selected_location,
-                    "delivery_type": "delivery",
-                    "return_location": self._get_return_location()
-                }
-                self._app_controller.start_delivery_process(delivery_data)
+                if self._multi_select:
+                    # One trip: every stop in route order; "location" is the first one
+                    stops = [self._locations.location(i) for i in self._route_stops()]
+                    delivery_data = {
+                        "location": stops[0],
+                        "locations": stops,
+                        "delivery_type": "multi_delivery",
+                        "return_location": self._get_return_location()
+                    }
+                else:
+                    delivery_data = {
+                        "location": self._locations.location(self._selected_index),
+                        "delivery_type": "delivery",
+                        "return_location": self._get_return_location()
+                    }
+                # Identical requests while one is in flight resolve to the same job
+                key = json.dumps(delivery_data, sort_keys=True)
+                job = self._delivery_dispatcher.submit(self._app_controller.start_delivery_process, delivery_data, key)
+                if job is self._delivery_job:
+                    return
+                self._delivery_job = job
+                self.start_button.setText("Starting...")
+                self._update_start_button()
         else:
             if self._app_controller:
                 self._app_controller.show_message("Please select a location first", "warning")
     
+    def _on_delivery_progress(self, job: DeliveryJob, percent: int, message: str) -> None:
+        if job is self._delivery_job:
+            self.start_button.setText(f"{message or 'Starting'}... {percent}%")
+    
+    def _on_delivery_completed(self, job: DeliveryJob, result: Any) -> None:
+        if job is self._delivery_job:
+            self._delivery_job = None
+            self._update_start_button()
+    
+    def _on_delivery_failed(self, job: DeliveryJob, error: str) -> None:
+        if job is not self._delivery_job:
+            return
+        self._delivery_job = None
+        self._update_start_button()
+        if self._app_controller and job.state != DeliveryJob.CANCELLED:
+            self._app_controller.show_message(f"Could not start delivery: {error}", "error")
+    
     def _get_return_location(self) -> Optional[Dict[str, Any]]:
         """Get the return location"""
         if self._r_base_name and self._r_base_cord:
@@ -631,12 +2773,28 @@ class DeliveryView(BaseView, ThemeableMixin):
         """Show return location selection popup"""
         self._show_location_selection_popup("Select Return Location", "Base_Locations", self._on_return_location_selected)
     
+    @profiled()
     def _show_location_selection_popup(self, title: str, location_key: str, callback) -> None:
         """Show location selection popup"""
+        # The popup is built on first use and repopulated on every later opening
+        if self.location_popup is None:
+            self._create_location_popup()
+        self._popup_callback = callback
+        self.popup_title.setText(title)
+        self.popup_current_page = 0
+        self._create_popup_location_buttons(location_key)
+        
+        self.location_popup.setGeometry(self.rect())
+        self.location_popup.show()
+        self.location_popup.raise_()
+    
+    @profiled()
+    def _create_location_popup(self) -> None:
+        """Build the location selection popup widget tree once"""
         # Create popup frame
         self.location_popup = QFrame(self)
-        self.location_popup.show()
-        self.location_popup.setStyleSheet(self._get_themed_stylesheet("frame", "white"))
+        self.location_popup.hide()
+        self.location_popup.setProperty("role", "white")
         
         # Layout for popup
         popup_layout = QVBoxLayout(self.location_popup)
@@ -646,21 +2804,21 @@ class DeliveryView(BaseView, ThemeableMixin):
         # Back button
         self.popup_back_button = QPushButton("←", self.location_popup)
         self.popup_back_button.setFixedSize(70, 70)
-        self.popup_back_button.setStyleSheet(self._get_themed_stylesheet("button", "nav_button"))
-        self.popup_back_button.clicked.connect(self.location_popup.close)
+        self.popup_back_button.setProperty("role", "nav_button")
+        self.popup_back_button.clicked.connect(self.location_popup.hide)
         popup_layout.addWidget(self.popup_back_button, alignment=Qt.AlignLeft)
         
         # Title
-        self.popup_title = QLabel(title, self.location_popup)
+        self.popup_title = QLabel("", self.location_popup)
         self.popup_title.setFont(QFont("Montserrat", 40))
-        self.popup_title.setStyleSheet(self._get_themed_stylesheet("label", "heading"))
+        self.popup_title.setProperty("role", "heading")
         self.popup_title.setAlignment(Qt.AlignCenter)
         popup_layout.addWidget(self.popup_title)
         
         # Pagination info label
         self.popup_pagination_label = QLabel("", self.location_popup)
         self.popup_pagination_label.setFont(QFont("Montserrat", 20))
-        self.popup_pagination_label.setStyleSheet(self._get_themed_stylesheet("label", "normal"))
+        self.popup_pagination_label.setProperty("role", "normal")
         self.popup_pagination_label.setAlignment(Qt.AlignCenter)
         popup_layout.addWidget(self.popup_pagination_label)
         
@@ -668,26 +2826,26 @@ class DeliveryView(BaseView, ThemeableMixin):
         self.popup_button_container_frame = QFrame(
             self.location_popup,
         )
-        self.popup_button_container_frame.setStyleSheet(self._get_themed_stylesheet("frame"))
+        self.popup_button_container_frame.setProperty("role", "frame")
         popup_layout.addWidget(self.popup_button_container_frame)
         
         popup_button_container_layout = QVBoxLayout(self.popup_button_container_frame)
         popup_button_container_layout.setContentsMargins(10,10,10,10)
         
-        # Grid frame for buttons (Qt grid layout)
-        self.popup_grid_frame = QFrame(self.popup_button_container_frame)
-        self.popup_grid_frame.setStyleSheet("background-color: white;")
-        # self.popup_grid_frame.show() # No need to call show directly
-        self.popup_grid_layout = QGridLayout(self.popup_grid_frame)
-        self.popup_grid_layout.setSpacing(20)
+        # Grid frame for buttons; cells are created once and rebound per page
+        self.popup_grid_frame = LocationPageGrid(self.popup_button_container_frame, 4, 4, button_role="popup_location")
+        self.popup_grid_frame.setProperty("role", "popup_grid")
+        self.popup_grid_frame.location_clicked.connect(self._on_popup_location_click)
+        self.popup_grid_frame.page_scrolled.connect(self._on_popup_page_scrolled)
+        self.popup_grid_layout = self.popup_grid_frame.grid_layout
         popup_button_container_layout.addWidget(self.popup_grid_frame)
         
         # Configure grid
         for i in range(4):
-            self.popup_grid_layout.columnMinimumWidth(i, 200)
+            self.popup_grid_layout.setColumnMinimumWidth(i, 200)
             self.popup_grid_layout.setColumnStretch(i, 1)
         for i in range(4):
-            self.popup_grid_layout.rowMinimumHeight(i, 80)
+            self.popup_grid_layout.setRowMinimumHeight(i, 80)
             self.popup_grid_layout.setRowStretch(i, 1)
         
         # Navigation buttons (positioned relative to button container frame like main page)
@@ -696,13 +2854,13 @@ class DeliveryView(BaseView, ThemeableMixin):
         
         self.popup_prev_button = QPushButton("↑", self.popup_button_container_frame)
         self.popup_prev_button.setFixedSize(70, 80)
-        self.popup_prev_button.setStyleSheet(self._get_themed_stylesheet("button", "nav_button"))
+        self.popup_prev_button.setProperty("role", "nav_button")
         self.popup_prev_button.clicked.connect(self._popup_prev_page)
         popup_nav_layout.addWidget(self.popup_prev_button)
         
         self.popup_next_button = QPushButton("↓", self.popup_button_container_frame)
         self.popup_next_button.setFixedSize(70, 80)
-        self.popup_next_button.setStyleSheet(self._get_themed_stylesheet("button", "nav_button"))
+        self.popup_next_button.setProperty("role", "nav_button")
         self.popup_next_button.clicked.connect(self._popup_next_page)
         popup_nav_layout.addWidget(self.popup_next_button)
         
@@ -710,68 +2868,56 @@ class DeliveryView(BaseView, ThemeableMixin):
         
         # Initialize pagination variables
         self.popup_current_page = 0
-        self.popup_buttons_per_page = 16  # 4x4 grid
-        self.popup_all_buttons = []
-        
-        # Create location buttons
-        self._create_popup_location_buttons(location_key, callback)
+        self.popup_buttons_per_page = self.popup_grid_frame.page_size  # 4x4 grid
+        self.popup_store = LocationStore(stride=6)
+        self.popup_order: List[int] = []  # store ids in display order
         
         # Confirm button
         self.popup_confirm_button = QPushButton("Confirm Location", self.location_popup)
         self.popup_confirm_button.setFixedWidth(300)
         self.popup_confirm_button.setFont(QFont("Montserrat", 45))
-        self.popup_confirm_button.setStyleSheet(self._get_themed_stylesheet("button", "start_delivery").replace(self.get_theme_color('button_color'), "#4DA6FF"))
-        self.popup_confirm_button.clicked.connect(lambda: self._confirm_location_selection(callback))
+        self.popup_confirm_button.setProperty("role", "popup_confirm")
+        self.popup_confirm_button.clicked.connect(self._confirm_location_selection)
         popup_layout.addWidget(self.popup_confirm_button, alignment=Qt.AlignCenter)
     
-    def _create_popup_location_buttons(self, location_key: str, callback) -> None:
-        """Create location buttons for popup with pagination"""
-        self.popup_buttons = []
+    @profiled()
+    def _create_popup_location_buttons(self, location_key: str) -> None:
+        """Bind the popup grid to the locations under `location_key`"""
         self.popup_selected_location = None
-        
-        locations = self._return_base_location_list.get(location_key, [])
-        
-        # Create all buttons first
-        self.popup_all_buttons = []
-        for location in locations:
-            button = QPushButton(location["name"], self.popup_grid_frame)
-            button.setFont(QFont("Montserrat", 45))
-            button.setStyleSheet(self._get_themed_stylesheet("button"))
-            button.clicked.connect(lambda loc=location: self._on_popup_location_click(loc))
-            self.popup_all_buttons.append(button)
+        self.popup_selected_index = None
+        self.popup_store = self._return_base_location_list.get(location_key) or LocationStore(stride=6)
+        self.popup_order = list(range(len(self.popup_store)))
+        
+        # Offer the bases closest to the selected table first
+        if location_key == "Base_Locations" and self._location_selected:
+            order = self._nearest_bases(self._goal_location, len(self.popup_store))
+            if order:
+                ordered = set(order)
+                order.extend(i for i in self.popup_order if i not in ordered)  # bases without coordinates
+                self.popup_order = order
         
         # Display first page
         self._display_popup_buttons_page(0)
     
+    @profiled()
     def _display_popup_buttons_page(self, page_num: int) -> None:
         """Display buttons for the specified page"""
-        # Clear current items from popup grid layout
-        if hasattr(self, 'popup_grid_layout'):
-            while self.popup_grid_layout.count():
-                item = self.popup_grid_layout.takeAt(0)
-                w = item.widget()
-                if w:
-                    w.hide()
-        
         # Calculate start and end indices
         start_index = page_num * self.popup_buttons_per_page
         end_index = start_index + self.popup_buttons_per_page
-        buttons_to_display = self.popup_all_buttons[start_index:end_index]
         
-        # Add buttons to layout for the current page
-        for i, button in enumerate(buttons_to_display):
-            row = i // 4
-            column = i % 4
-            self.popup_grid_layout.addWidget(button, row, column)
-            button.show()
+        # Rebind the grid cells to the locations on this page
+        location_ids = self.popup_order[start_index:end_index]
+        labels = [self.popup_store.name(i) for i in location_ids]
+        self.popup_grid_frame.bind_page(location_ids, labels, self.popup_selected_index)
         
         # Update pagination info
-        total_pages = (len(self.popup_all_buttons) + self.popup_buttons_per_page - 1) // self.popup_buttons_per_page
-        self.popup_pagination_label.setText(f"Page {page_num + 1} of {total_pages} ({len(self.popup_all_buttons)} locations)")
+        total_pages = (len(self.popup_order) + self.popup_buttons_per_page - 1) // self.popup_buttons_per_page
+        self.popup_pagination_label.setText(f"Page {page_num + 1} of {total_pages} ({len(self.popup_order)} locations)")
         
         # Update navigation button states
         self.popup_prev_button.setEnabled(page_num > 0)
-        self.popup_next_button.setEnabled((page_num + 1) * self.popup_buttons_per_page < len(self.popup_all_buttons))
+        self.popup_next_button.setEnabled((page_num + 1) * self.popup_buttons_per_page < len(self.popup_order))
     
     def _popup_prev_page(self) -> None:
         """Go to previous page in popup"""
@@ -781,31 +2927,36 @@ class DeliveryView(BaseView, ThemeableMixin):
     
     def _popup_next_page(self) -> None:
         """Go to next page in popup"""
-        if (self.popup_current_page + 1) * self.popup_buttons_per_page < len(self.popup_all_buttons):
+        if (self.popup_current_page + 1) * self.popup_buttons_per_page < len(self.popup_order):
             self.popup_current_page += 1
             self._display_popup_buttons_page(self.popup_current_page)
     
-    def _on_popup_location_click(self, location: Dict[str, Any]) -> None:
+    def _on_popup_page_scrolled(self, step: int) -> None:
+        """Handle scroll navigation over the popup grid"""
+        if step > 0:
+            self._popup_next_page()
+        else:
+            self._popup_prev_page()
+    
+    @profiled()
+    def _on_popup_location_click(self, index: int) -> None:
         """Handle popup location button click"""
         # Highlight selected button
-        for button in self.popup_all_buttons:
-            button.setStyleSheet(self._get_themed_stylesheet("button")) # Reset others
-            if button.text() == location["name"]:
-                button.setStyleSheet(self._get_themed_stylesheet("button", "selected").replace(self.get_theme_color('changing_button_fg'), "#4DA6FF")) # Highlight
-                self.popup_selected_location = location
-                self.popup_selected_button = button # Store reference to the selected button
-                break
+        self.popup_grid_frame.set_selection(self.popup_selected_index, index)
+        self.popup_selected_index = index
+        self.popup_selected_location = self.popup_store.location(index)
     
-    def _confirm_location_selection(self, callback) -> None:
+    def _confirm_location_selection(self) -> None:
         """Confirm location selection"""
-        if self.popup_selected_location:
-            callback(self.popup_selected_location)
-        if hasattr(self, 'location_popup') and self.location_popup:
-            self.location_popup.close()
-            self.location_popup.deleteLater()
+        if self.popup_selected_location and self._popup_callback:
+            self._popup_callback(self.popup_selected_location)
+        if self.location_popup is not None:
+            # Kept for the next opening instead of being rebuilt
+            self.location_popup.hide()
     
     def _on_base_location_selected(self, location: Dict[str, Any]) -> None:
         """Handle base location selection"""
+        self._return_base_chosen = True
         self._r_base_name = location["name"]
         self._r_base_cord = location["cordinates"]
         self._update_return_location_display()
@@ -815,6 +2966,7 @@ class DeliveryView(BaseView, ThemeableMixin):
     
     def _on_return_location_selected(self, location: Dict[str, Any]) -> None:
         """Handle return location selection"""
+        self._return_base_chosen = True
         self._r_base_name = location["name"]
         self._r_base_cord = location["cordinates"]
         self._update_return_location_display()
@@ -826,20 +2978,14 @@ class DeliveryView(BaseView, ThemeableMixin):
         """Update return location display"""
         # Get default location if none selected
         if not self._r_base_name:
-            default_base_locs = self._return_base_location_list.get("Default_Base_Loc", [])
-            if default_base_locs:
-                default_loc = default_base_locs[0]
-                self._r_base_name = default_loc["name"]
-                self._r_base_cord = default_loc.get("cordinates") or default_loc.get("coordinates")
+            default_base_locs = self._return_base_location_list.get("Default_Base_Loc")
+            if default_base_locs is not None and len(default_base_locs):
+                self._r_base_name = default_base_locs.name(0)
+                self._r_base_cord = default_base_locs.cordinates(0)
         
         # Update button text
         if hasattr(self, 'return_location_button'):
             self.return_location_button.setText(self._r_base_name or "Return to Base")
-            # Update color if needed
-            if self._r_base_name:
-                self.return_location_button.setStyleSheet(f"background-color: {self.get_theme_color('button_color')}; color: white; border-radius: 0px;")
-            else:
-                self.return_location_button.setStyleSheet(f"background-color: {self.get_theme_color('button_color')}; color: white; border-radius: 0px;")
     
     def show(self) -> None:
         """Show the delivery view"""
@@ -852,73 +2998,37 @@ class DeliveryView(BaseView, ThemeableMixin):
         super().hide()
     
     def update_theme(self) -> None:
-        """Update theme colors"""
-        self._setup_theme()
-        
-        # Update all UI elements with new theme colors
-        if hasattr(self, 'main_frame'):
-            self.main_frame.setStyleSheet(self._get_themed_stylesheet("frame", "white"))
-        if hasattr(self, 'upper_frame'):
-            self.upper_frame.setStyleSheet(self._get_themed_stylesheet("frame"))
-        if hasattr(self, 'title_label'):
-            self.title_label.setStyleSheet(self._get_themed_stylesheet("label", "heading"))
-        if hasattr(self, 'back_button'):
-            self.back_button.setStyleSheet(self._get_themed_stylesheet("button", "nav_button"))
-        
-        # Update navigation buttons
-        if hasattr(self, 'prev_page_button'):
-            self.prev_page_button.setStyleSheet(self._get_themed_stylesheet("button", "nav_button"))
-        if hasattr(self, 'next_page_button'):
-            self.next_page_button.setStyleSheet(self._get_themed_stylesheet("button", "nav_button"))
-        
-        # Update location buttons
-        for button in self._all_buttons:
-            if button != self._current_button:
-                button.setStyleSheet(self._get_themed_stylesheet("button"))
-            else:
-                button.setStyleSheet(self._get_themed_stylesheet("button", "selected"))
-                
-        # Update action buttons
-        if hasattr(self, 'base_button'):
-            self.base_button.setStyleSheet(self._get_themed_stylesheet("button", "base_event_button"))
-        
-        # Update return location button
-        if hasattr(self, 'return_location_frame'):
-            self.return_location_frame.setStyleSheet(f"background-color: {self.get_theme_color('button_color')}; border-radius: 10px;")
-        if hasattr(self, 'return_location_button'):
-            self.return_location_button.setStyleSheet(f"background-color: {self.get_theme_color('button_color')}; color: white; border-radius: 0px;")
-        if hasattr(self, 'return_edit_button'):
-            self.return_edit_button.setStyleSheet(self._get_themed_stylesheet("button", "edit_button"))
-        
-        # Update location display
-        self._update_location_display()
+        """Update theme colors
         
-        # Update start button
-        if hasattr(self, 'start_button'):
-            self._update_start_button()
-            
-        # Update popup elements if they exist
-        if hasattr(self, 'location_popup') and self.location_popup.isVisible():
-            self.location_popup.setStyleSheet(self._get_themed_stylesheet("frame", "white"))
-            self.popup_back_button.setStyleSheet(self._get_themed_stylesheet("button", "nav_button"))
-            self.popup_title.setStyleSheet(self._get_themed_stylesheet("label", "heading"))
-            self.popup_pagination_label.setStyleSheet(self._get_themed_stylesheet("label", "normal"))
-            self.popup_button_container_frame.setStyleSheet(self._get_themed_stylesheet("frame"))
-            self.popup_grid_frame.setStyleSheet("background-color: white;")
-            self.popup_prev_button.setStyleSheet(self._get_themed_stylesheet("button", "nav_button"))
-            self.popup_next_button.setStyleSheet(self._get_themed_stylesheet("button", "nav_button"))
-            self.popup_confirm_button.setStyleSheet(self._get_themed_stylesheet("button", "start_delivery").replace(self.get_theme_color('button_color'), "#4DA6FF"))
-            for button in self.popup_all_buttons:
-                if button != getattr(self, 'popup_selected_button', None):
-                    button.setStyleSheet(self._get_themed_stylesheet("button"))
-                else:
-                    button.setStyleSheet(self._get_themed_stylesheet("button", "selected").replace(self.get_theme_color('changing_button_fg'), "#4DA6FF"))
+        The restyle is scheduled rather than done here, so any number of theme
+        or colour changes before control returns to the event loop collapse
+        into a single one.
+        """
+        self._theme_update_timer.start()
+    
+    @profiled()
+    def _apply_theme_update(self) -> None:
+        """Restyle the view for the current theme, repainting it once"""
+        # Recompiles and re-applies the single view stylesheet; widget roles and
+        # states are properties, so nothing has to be restyled one by one
+        updates_enabled = self.updatesEnabled()
+        self.setUpdatesEnabled(False)
+        try:
+            self._setup_theme()
+        finally:
+            self.setUpdatesEnabled(updates_enabled)
+        if updates_enabled:
+            self.update()
                     
     def destroy(self) -> None:
         """Destroy the view"""
         try:
+            self._unbind_location_repository()
+            if self._delivery_job is not None:
+                self._delivery_job.cancel()
+            
             # Clean up any popups
-            if hasattr(self, 'location_popup') and self.location_popup:
+            if self.location_popup is not None:
                 try:
                     self.location_popup.close()
                     self.location_popup.deleteLater()
@@ -1,21 +1,206 @@
+import bisect
+import itertools
+import os
+import queue
+import re
+import sqlite3
 import sys
+import threading
 
 
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget,QVBoxLayout,
   QHBoxLayout,QGridLayout,QPushButton,QFormLayout,
   QLineEdit,QLabel,QTextEdit,QListView,
 )
-from PySide6.QtCore import QObject,Signal,QTimer,QAbstractListModel,Qt,QModelIndex
+from PySide6.QtCore import QObject,Signal,QTimer,QAbstractListModel,QAbstractProxyModel,Qt,QModelIndex
+from PySide6.QtGui import QBrush,QFont
 # from layout_color_widget import Color
 
+# Where tasks are kept between runs; TASK_DB_PATH overrides it
+TASK_DB_PATH = os.environ.get(
+    "TASK_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "tasks.db"))
+
+
+class TaskStore:
+    # SQLite (WAL mode) storage for the task list.
+    # Reads run on the caller's (GUI) thread and only ever fetch one page of
+    # rows; writes are queued and committed by a background thread in
+    # batched transactions, so adding tasks never waits on the disk.
+    def __init__(self, path=TASK_DB_PATH, fetch_size=1000):
+        self.path = path
+        self.fetch_size = fetch_size
+        self._reader = self._connect()
+        self._reader.execute("CREATE TABLE IF NOT EXISTS tasks (id INTEGER PRIMARY KEY, text TEXT NOT NULL)")
+        self._reader.commit()
+        self._writes = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="TaskStoreWriter", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    # Highest stored id; O(log n) on the primary key, unlike count(*)
+    def last_id(self):
+        return self._reader.execute("SELECT max(id) FROM tasks").fetchone()[0] or 0
+
+    # One page of (id, text) rows after `after_id`, up to `upto_id` inclusive
+    def fetch_after(self, after_id, upto_id, limit=None):
+        return self._reader.execute(
+            "SELECT id, text FROM tasks WHERE id > ? AND id <= ? ORDER BY id LIMIT ?",
+            (after_id, upto_id, limit or self.fetch_size)).fetchall()
+
+    # Texts of the stored tasks up to `upto_id`, read one page at a time
+    def iter_texts(self, upto_id):
+        after_id = 0
+        while True:
+            rows = self.fetch_after(after_id, upto_id)
+            if not rows:
+                return
+            after_id = rows[-1][0]
+            for _, text in rows:
+                yield text
+
+    # Queue rows for writing; returns immediately
+    def insert(self, rows):
+        self._writes.put(("insert", list(rows)))
+
+    # Queue a full replacement of the stored tasks
+    def replace(self, rows):
+        self._writes.put(("replace", list(rows)))
+
+    # Block until everything queued so far is committed
+    def flush(self):
+        done = threading.Event()
+        self._writes.put(("flush", done))
+        done.wait()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._writes.put(None)
+            self._writer.join()
+        self._reader.close()
+
+    def _write_loop(self):
+        connection = self._connect()
+        try:
+            while True:
+                # Take everything queued so far and commit it as one transaction
+                batch = [self._writes.get()]
+                while True:
+                    try:
+                        batch.append(self._writes.get_nowait())
+                    except queue.Empty:
+                        break
+                waiters = []
+                try:
+                    with connection:
+                        for command in batch:
+                            if command is None:
+                                continue
+                            kind, payload = command
+                            if kind == "insert":
+                                connection.executemany("INSERT OR REPLACE INTO tasks (id, text) VALUES (?, ?)", payload)
+                            elif kind == "replace":
+                                connection.execute("DELETE FROM tasks")
+                                connection.executemany("INSERT INTO tasks (id, text) VALUES (?, ?)", payload)
+                            elif kind == "flush":
+                                waiters.append(payload)
+                except sqlite3.Error as e:
+                    print(f"Error saving tasks: {e}")
+                for done in waiters:
+                    done.set()
+                if None in batch:
+                    return
+        finally:
+            connection.close()
+
+
+def row_text(row):
+    # A row source may hand us lines of a text file, bytes, or database rows;
+    # a database row contributes its last column, so "SELECT text" and
+    # "SELECT id, text" both work
+    if isinstance(row, bytes):
+        row = row.decode("utf-8")
+    elif isinstance(row, (tuple, list, sqlite3.Row)):
+        row = row[-1]
+    return str(row).rstrip("\r\n")
+
+
 class MenuModal(QAbstractListModel):
-    def __init__(self,parent = None):
+    def __init__(self,parent = None, store = None, rows = None, fetch_size = 1000):
         super().__init__(parent)
         self._data = []
+        # Rows not shown yet come from an iterator (a generator, an open file,
+        # a database cursor...). rowCount only covers what has been pulled, and
+        # the view asks for the next page through canFetchMore/fetchMore as it
+        # scrolls, so opening the list costs one page whatever the source size.
+        self.fetch_size = fetch_size
+        self._rows = None
+        self._tail_count = 0                                   # last rows: tasks added before the source ran out
+        # data() results per row, built on first paint. Only a fetched page
+        # landing above the session's new tasks moves rows; theirs are dropped
+        # then, otherwise the cache holds until dataChanged or a reset.
+        font = QFont()
+        self._row_styles = (
+            {Qt.ItemDataRole.BackgroundRole: QBrush(Qt.GlobalColor.lightGray), Qt.ItemDataRole.FontRole: font},
+            {Qt.ItemDataRole.BackgroundRole: QBrush(Qt.GlobalColor.white), Qt.ItemDataRole.FontRole: font},
+        )
+        self._role_cache = {}
+        self.dataChanged.connect(self._drop_cached_roles)
+        self.modelReset.connect(self._role_cache.clear)
+        # Optional persistent storage; its rows are the source and tasks added
+        # in this session are written through to it
+        self._store = store
+        self._next_id = 1
+        if store is not None:
+            stored_id = store.last_id()
+            self._next_id = stored_id + 1
+            self._rows = store.iter_texts(stored_id)
+        elif rows is not None:
+            self._rows = iter(rows)
     # # data = []
     #     self.data = []
     def rowCount(self, parent = QModelIndex()):
         return len(self._data)
+
+    # Show rows from another source, pulled lazily like the stored ones
+    def set_row_source(self, rows):
+        self.beginResetModel()
+        self._data = []
+        self._tail_count = 0
+        self._rows = iter(rows)
+        self.endResetModel()
+
+    def canFetchMore(self, parent = QModelIndex()):
+        return not parent.isValid() and self._rows is not None
+
+    def fetchMore(self, parent = QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        items = [row_text(row) for row in itertools.islice(self._rows, self.fetch_size)]
+        if items:
+            # Source rows go above the tasks added in this session
+            first_row = len(self._data) - self._tail_count
+            self.beginInsertRows(QModelIndex(), first_row, first_row + len(items) - 1)
+            self._data[first_row:first_row] = items
+            for row in range(first_row, first_row + self._tail_count):
+                self._role_cache.pop(row, None)
+            self.endInsertRows()
+        if len(items) < self.fetch_size:
+            # Source exhausted: the new tasks now follow every stored row
+            self._rows = None
+            self._tail_count = 0
+
+    # Assign ids to new tasks and queue them for saving
+    def _store_items(self, items):
+        if self._store is None:
+            return
+        first_id = self._next_id
+        self._next_id += len(items)
+        self._store.insert(zip(range(first_id, self._next_id), items))
     # def add_task_item(self,item):
     #     # self.beginInsertW
         
@@ -23,28 +208,42 @@ class MenuModal(QAbstractListModel):
     #     self.data.append(item)
     #     self.endInsertRows()
 
+    # Roles data() answers; anything else returns straight away
+    SERVED_ROLES = frozenset({Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.FontRole})
+
     def data(self, index, role):
-        if not index.isValid():
+        # The view asks for a dozen roles per row on every paint; most of
+        # them we never serve
+        if role not in self.SERVED_ROLES or not index.isValid():
             return None
 
-        # We only care about the display role (the text content)
+        row = index.row()
+        cached = self._role_cache.get(row)
+        if cached is None:
+            # Alternating rows share one style (brush + font) per parity
+            cached = self._role_cache[row] = (self._data[row], self._row_styles[row % 2])
         if role == Qt.ItemDataRole.DisplayRole:
-            # Look up the text based on the row number
-            return self._data[index.row()]
-        
-        # Optional: Add a simple color role for demonstration
-        if role == Qt.ItemDataRole.BackgroundRole:
-            if index.row() % 2 == 0:
-                return Qt.GlobalColor.lightGray
-            return Qt.GlobalColor.white
+            return cached[0]
+        return cached[1][role]
 
-        return None # Return None for all other roles
+    # Cached roles only go stale when a row's data changes
+    def _drop_cached_roles(self, top_left, bottom_right, roles=()):
+        if len(self._role_cache) <= bottom_right.row() - top_left.row() + 1:
+            self._role_cache.clear()
+            return
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            self._role_cache.pop(row, None)
 
     # Slot called by the MainWindow to add an item
     def add_task_item(self, item):
         # FIX 3: Resetting self.data = [] here would delete the whole list.
         # We need the current length to calculate the insertion row.
         
+        self._store_items([item])
+        if self.canFetchMore():
+            # Stored rows before it are not loaded yet; they will go in above it
+            self._tail_count += 1
+
         # 1. Calculate the new row index (which is the current length)
         row_to_insert = len(self._data)
         
@@ -59,16 +258,446 @@ class MenuModal(QAbstractListModel):
         self.endInsertRows()
         return True # Return success
 
+    # Bulk path (e.g. importing tasks): one notification for the whole range
+    # instead of one per item, so the view relayouts once.
+    def add_task_items(self, items):
+        new_items = list(items)
+        if not new_items:
+            return False
+
+        self._store_items(new_items)
+        if self.canFetchMore():
+            self._tail_count += len(new_items)
+
+        first_row = len(self._data)
+        last_row = first_row + len(new_items) - 1
+        self.beginInsertRows(QModelIndex(), first_row, last_row)
+        self._data.extend(new_items)
+        self.endInsertRows()
+        return True
+
+    # Replace every task at once; the view drops and rebuilds its rows a single time.
+    def reset_tasks(self, items=()):
+        self.beginResetModel()
+        self._data = list(items)
+        self._tail_count = 0
+        if self._store is not None:
+            # Everything is in memory now; rewrite the store to match
+            self._store.replace(enumerate(self._data, start=1))
+            self._next_id = len(self._data) + 1
+        self._rows = None
+        self.endResetModel()
+
+# Words of a task for searching: runs of letters/digits, case-folded
+TASK_WORD = re.compile(r"\w+")
+
+
+class TaskFilterProxy(QAbstractProxyModel):
+    # Search and sort over a flat task model (MenuModal).
+    # Keeps an inverted index (word -> source rows) that is updated as rows
+    # are inserted or edited, so a new filter is a few set operations rather
+    # than a pass over every task. Each query word matches as a prefix of a
+    # task word, so results narrow while the user types.
+    # Filter and sort changes emit row insert/remove signals for just the rows
+    # that appear or disappear; only when that would take more than
+    # MAX_ROW_MOVES separate blocks is the view reset instead.
+    MAX_ROW_MOVES = 256
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._texts = []          # case-folded text per source row
+        self._all_rows = set()    # every source row, for the empty query
+        self._postings = {}       # word -> set of source rows containing it
+        self._vocab = []          # sorted words, for prefix lookups
+        self._terms = ()          # current query words
+        self._sort_column = -1    # -1 keeps source order
+        self._sort_order = Qt.SortOrder.AscendingOrder
+        # While sorting by text: source rows in text order, each row's rank
+        # and the row holding each rank. Ranks are ascending floats, so a new
+        # row takes the midpoint of its neighbours instead of renumbering.
+        self._by_text = None
+        self._rank = None
+        self._row_at = None
+        self._visible = set()     # source rows shown
+        self._order = []          # keys (row or rank) of the shown rows, ascending
+        self._source_connections = []
+
+    def setSourceModel(self, model):
+        for connection in self._source_connections:
+            QObject.disconnect(connection)
+        super().setSourceModel(model)
+        self._source_connections = []
+        if model is not None:
+            self._source_connections = [
+                model.rowsInserted.connect(self._on_rows_inserted),
+                model.dataChanged.connect(self._on_data_changed),
+                # Anything that moves existing rows invalidates the index
+                model.rowsRemoved.connect(self._rebuild),
+                model.rowsMoved.connect(self._rebuild),
+                model.modelReset.connect(self._rebuild),
+                model.layoutChanged.connect(self._rebuild),
+            ]
+        self._rebuild()
+
+    # --- QAbstractProxyModel interface ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 1
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or column != 0 or not 0 <= row < len(self._order):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        if index is None:
+            return QObject.parent(self)
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or self.sourceModel() is None:
+            return QModelIndex()
+        key = self._order[self._proxy_row(proxy_index.row(), len(self._order))]
+        return self.sourceModel().index(key if self._rank is None else self._row_at[key], 0)
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid() or source_index.row() not in self._visible:
+            return QModelIndex()
+        position = bisect.bisect_left(self._order, self._key(source_index.row()))
+        return self.index(self._proxy_row(position, len(self._order)), 0)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        # column 0 sorts by task text, -1 restores the source order (which
+        # has no direction, so the order is reset to ascending)
+        column = 0 if column >= 0 else -1
+        if column < 0:
+            order = Qt.SortOrder.AscendingOrder
+        if self.sourceModel() is None or (column, order) == (self._sort_column, self._sort_order):
+            return
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        source_rows = [self.mapToSource(index).row() for index in persistent]
+        self._sort_column, self._sort_order = column, order
+        if column < 0:
+            self._by_text = self._rank = self._row_at = None
+        elif self._rank is None:
+            self._rank_all()
+        self._order = self._ordered(self._visible)
+        self.changePersistentIndexList(persistent, [self.mapFromSource(self.sourceModel().index(row, 0))
+                                                    for row in source_rows])
+        self.layoutChanged.emit()
+
+    # --- filtering ---
+
+    def filter_text(self):
+        return " ".join(self._terms)
+
+    # Show only tasks containing every word of `text` (as a word prefix)
+    def set_filter_text(self, text):
+        terms = tuple(TASK_WORD.findall(text.casefold()))
+        if terms == self._terms:
+            return
+        self._terms = terms
+        self._show_rows(self._matching_rows())
+
+    def _matching_rows(self):
+        if not self._terms:
+            return self._all_rows.copy()
+        matches = None
+        # Longer words select fewer rows; start with those
+        for term in sorted(self._terms, key=len, reverse=True):
+            first = bisect.bisect_left(self._vocab, term)
+            last = bisect.bisect_left(self._vocab, term + "\U0010ffff", first)
+            words = self._vocab[first:last]
+            if matches is None:
+                matches = set().union(*(self._postings[word] for word in words))
+            else:
+                matches = {row for word in words for row in matches & self._postings[word]}
+            if not matches:
+                break
+        return matches
+
+    def _row_matches(self, row):
+        words = TASK_WORD.findall(self._texts[row])
+        return all(any(word.startswith(term) for word in words) for term in self._terms)
+
+    # --- keeping the index and the shown rows in step with the source ---
+
+    def _source_texts(self, rows):
+        model = self.sourceModel()
+        return [str(model.index(row, 0).data() or "").casefold() for row in rows]
+
+    def _rebuild(self, *args):
+        self.beginResetModel()
+        self._texts, self._postings, self._vocab = [], {}, []
+        self._all_rows, self._visible, self._order = set(), set(), []
+        if self.sourceModel() is not None:
+            self._texts = self._source_texts(range(self.sourceModel().rowCount()))
+            self._index_rows(range(len(self._texts)))
+            self._all_rows = set(range(len(self._texts)))
+            if self._sort_column >= 0:
+                self._rank_all()
+            self._visible = self._matching_rows()
+            self._order = self._ordered(self._visible)
+        self.endResetModel()
+
+    def _index_rows(self, rows):
+        new_words = []
+        for row in rows:
+            for word in set(TASK_WORD.findall(self._texts[row])):
+                postings = self._postings.get(word)
+                if postings is None:
+                    self._postings[word] = {row}
+                    new_words.append(word)
+                else:
+                    postings.add(row)
+        if new_words:
+            self._vocab.extend(new_words)
+            self._vocab.sort()
+
+    def _unindex_row(self, row):
+        for word in set(TASK_WORD.findall(self._texts[row])):
+            postings = self._postings[word]
+            postings.discard(row)
+            if not postings:
+                del self._postings[word]
+                del self._vocab[bisect.bisect_left(self._vocab, word)]
+
+    def _on_rows_inserted(self, parent, first, last):
+        if parent.isValid():
+            return
+        new_rows = range(first, last + 1)
+        if first < len(self._texts):
+            # Inserted above other rows (a fetched page going in before tasks
+            # added meanwhile): move those down first
+            self._shift_rows(first, len(new_rows))
+        self._texts[first:first] = self._source_texts(new_rows)
+        self._index_rows(new_rows)
+        self._all_rows.update(range(first, len(self._texts)))
+        if self._rank is not None:
+            self._rank[first:first] = [0.0] * len(new_rows)
+            self._place_by_text(new_rows)
+        if self._terms:
+            new_rows = [row for row in new_rows if self._row_matches(row)]
+        if self._rank is None or len(new_rows) <= self.MAX_ROW_MOVES:
+            # None of the new rows is shown yet: in source order they form
+            # one block, sorted they fall into few enough blocks
+            self._insert_keys(self._ordered(new_rows))
+            self._visible.update(new_rows)
+        else:
+            self._show_rows(self._visible.union(new_rows))
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        rows = range(top_left.row(), bottom_right.row() + 1)
+        if roles and Qt.ItemDataRole.DisplayRole not in roles:
+            for row in rows:
+                proxy_index = self.mapFromSource(self.sourceModel().index(row, 0))
+                if proxy_index.isValid():
+                    self.dataChanged.emit(proxy_index, proxy_index, roles)
+            return
+        texts = self._source_texts(rows)
+        edited = [row for row, text in zip(rows, texts) if text != self._texts[row]]
+        moved = []
+        if self._rank is not None and edited:
+            # Edited rows may sort elsewhere: take them out at their old rank
+            moved = [row for row in edited if row in self._visible]
+            self._remove_keys(self._ordered(moved))
+            self._visible = self._visible.difference(moved)
+            for row in edited:
+                del self._by_text[bisect.bisect_left(self._by_text, (self._texts[row], row), key=self._text_key)]
+                del self._row_at[self._rank[row]]
+        for row in edited:
+            self._unindex_row(row)
+            self._texts[row] = texts[row - rows.start]
+        self._index_rows(edited)
+        if self._rank is not None and edited:
+            self._place_by_text(edited)
+        visible = self._visible.union(moved)
+        if self._terms:
+            visible = visible.difference(edited).union(row for row in edited if self._row_matches(row))
+        self._show_rows(visible, changed=rows)
+
+    # Renumber source rows from `first` on by `count`, ahead of inserting
+    # that many rows at `first`. Only those rows are touched: the ones after
+    # the insert point are few (tasks added while stored rows were unfetched).
+    def _shift_rows(self, first, count):
+        moved = range(len(self._texts) - 1, first - 1, -1)
+        # Last row first, so a row never lands on one not yet moved
+        for row in moved:
+            for word in set(TASK_WORD.findall(self._texts[row])):
+                postings = self._postings[word]
+                postings.discard(row)
+                postings.add(row + count)
+        shown = [row for row in moved if row in self._visible]
+        self._visible.difference_update(shown)
+        self._visible.update(row + count for row in shown)
+        if self._rank is None:
+            # Shown keys are the rows themselves; their order is unchanged
+            position = bisect.bisect_left(self._order, first)
+            self._order[position:] = [row + count for row in self._order[position:]]
+        else:
+            # Ranks stay, so the shown order does too; only rows are renamed
+            positions = [bisect.bisect_left(self._by_text, self._text_key(row), key=self._text_key)
+                         for row in moved]
+            for row, position in zip(moved, positions):
+                self._by_text[position] = row + count
+                self._row_at[self._rank[row]] = row + count
+
+    def _text_key(self, row):
+        return self._texts[row], row
+
+    # Binary-search `rows` (not yet in self._by_text, not shown) into text
+    # order, each ranked between its neighbours
+    def _place_by_text(self, rows):
+        if len(rows) > len(self._by_text) // 8:
+            # A large batch is cheaper to sort in one go
+            self._rank_all()
+            return
+        by_text, rank = self._by_text, self._rank
+        for row in rows:
+            position = bisect.bisect_left(by_text, self._text_key(row), key=self._text_key)
+            if position == len(by_text):
+                new_rank = rank[by_text[-1]] + 1.0 if by_text else 0.0
+            elif position == 0:
+                new_rank = rank[by_text[0]] - 1.0
+            else:
+                below, above = rank[by_text[position - 1]], rank[by_text[position]]
+                new_rank = (below + above) / 2
+                if not below < new_rank < above:
+                    # Out of room between the neighbours: space every rank out again
+                    by_text.insert(position, row)
+                    self._respace()
+                    rank = self._rank
+                    continue
+            by_text.insert(position, row)
+            rank[row] = new_rank
+            self._row_at[new_rank] = row
+
+    def _rank_all(self):
+        self._by_text = sorted(range(len(self._texts)), key=self._texts.__getitem__)
+        self._respace()
+
+    def _respace(self):
+        self._rank = [0.0] * len(self._texts)
+        for rank, row in enumerate(self._by_text):
+            self._rank[row] = float(rank)
+        self._row_at = dict(zip(map(float, range(len(self._by_text))), self._by_text))
+        # Shown rows keep their relative order; only their ranks moved
+        self._order = self._ordered(self._visible)
+
+    # Make `rows` (source rows) the shown set with as few signals as possible
+    def _show_rows(self, rows, changed=()):
+        moves = len(self._visible) + len(rows) - 2 * len(self._visible & rows)
+        removed_keys = added_keys = ()
+        if moves <= 16 * self.MAX_ROW_MOVES:
+            removed_keys = self._ordered(self._visible - rows)
+            added_keys = self._ordered(rows - self._visible)
+        if moves > 16 * self.MAX_ROW_MOVES or moves > self.MAX_ROW_MOVES and \
+                self._runs(removed_keys, 1) + self._runs(added_keys, 0) > self.MAX_ROW_MOVES:
+            # Too scattered to be worth per-block signals
+            self.beginResetModel()
+            self._visible = rows
+            self._order = self._ordered(rows)
+            self.endResetModel()
+            return
+        self._remove_keys(removed_keys)
+        self._insert_keys(added_keys)
+        self._visible = rows
+        for row in changed:
+            proxy_index = self.mapFromSource(self.sourceModel().index(row, 0))
+            if proxy_index.isValid():
+                self.dataChanged.emit(proxy_index, proxy_index)
+
+    # Number of blocks `keys` (sorted) form in the shown order, counted only
+    # as far as MAX_ROW_MOVES. Removed keys are contiguous when their
+    # positions step by one, inserted keys when they share a position.
+    def _runs(self, keys, step):
+        runs, previous = 0, None
+        for key in keys:
+            position = bisect.bisect_left(self._order, key)
+            if position != previous:
+                runs += 1
+                if runs > self.MAX_ROW_MOVES:
+                    break
+            previous = position + step
+        return runs
+
+    def _remove_keys(self, keys):
+        positions = [bisect.bisect_left(self._order, key) for key in keys]
+        # Contiguous blocks, last first so earlier positions stay valid
+        blocks = []
+        for position in positions:
+            if blocks and blocks[-1][1] == position - 1:
+                blocks[-1][1] = position
+            else:
+                blocks.append([position, position])
+        for first, last in reversed(blocks):
+            self.beginRemoveRows(QModelIndex(), *self._proxy_span(first, last, len(self._order)))
+            del self._order[first:last + 1]
+            self.endRemoveRows()
+
+    def _insert_keys(self, keys):
+        # Keys landing between the same two shown rows go in as one block
+        blocks = [(position, list(block)) for position, block
+                  in itertools.groupby(keys, key=lambda key: bisect.bisect_left(self._order, key))]
+        offset = 0
+        for position, block in blocks:
+            first = position + offset
+            last = first + len(block) - 1
+            self.beginInsertRows(QModelIndex(), *self._proxy_span(first, last, len(self._order) + len(block)))
+            self._order[first:first] = block
+            self.endInsertRows()
+            offset += len(block)
+
+    # --- sort order ---
+
+    # Where a source row sorts: the row itself, or its rank by text
+    def _key(self, row):
+        return row if self._rank is None else self._rank[row]
+
+    def _ordered(self, rows):
+        if self._rank is None:
+            return list(range(len(rows))) if len(rows) == len(self._texts) else sorted(rows)
+        if len(rows) == len(self._texts):
+            # Every row: the ranks in text order
+            return list(map(self._rank.__getitem__, self._by_text))
+        return sorted(map(self._rank.__getitem__, rows))
+
+    # self._order is always ascending; descending order reads it backwards
+    def _proxy_row(self, position, count):
+        if self._sort_order == Qt.SortOrder.DescendingOrder:
+            return count - 1 - position
+        return position
+
+    def _proxy_span(self, first, last, count):
+        if self._sort_order == Qt.SortOrder.DescendingOrder:
+            return count - 1 - last, count - 1 - first
+        return first, last
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.model = MenuModal()
+        self.store = TaskStore()
+        self.model = MenuModal(store=self.store)
         # model
         # self.data = []
         self.list_view = QListView()
+        # Every task is one line of text, so the view can size one row and
+        # reuse it instead of measuring all rows after each insert
+        self.list_view.setUniformItemSizes(True)
+        # Lay rows out a batch at a time between events, so a large page
+        # arriving from fetchMore never blocks the window
+        self.list_view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.list_view.setBatchSize(200)
 
-        # connect List with MenuModel
-        self.list_view.setModel(self.model)
+        # connect List with MenuModel, through the search/sort proxy
+        self.proxy = TaskFilterProxy()
+        self.proxy.setSourceModel(self.model)
+        self.list_view.setModel(self.proxy)
 
 
 
@@ -84,12 +713,25 @@ class MainWindow(QMainWindow):
         self.horizontal_layout.addWidget(self.task_inpt)
         self.horizontal_layout.addWidget(self.add_btn)
 
+        # Search / sort row
+        self.search_layout = QHBoxLayout()
+        self.search_inpt = QLineEdit()
+        self.search_inpt.setPlaceholderText('Search tasks')
+        self.sort_btn = QPushButton('Sort A-Z')
+        self.sort_btn.setCheckable(True)
+        self.search_layout.addWidget(self.search_inpt)
+        self.search_layout.addWidget(self.sort_btn)
+
         # Main Layout (Vertical Stack)
         main_layout = QVBoxLayout()
         main_layout.addLayout(self.horizontal_layout)
+        main_layout.addLayout(self.search_layout)
         main_layout.addWidget(self.list_view) 
         # connecting signals to the QListView
         self.add_btn.clicked.connect(self.get_text)
+        # Filter live as the user types
+        self.search_inpt.textChanged.connect(self.proxy.set_filter_text)
+        self.sort_btn.toggled.connect(self.sort_tasks)
         
         widget = QWidget()
         widget.setLayout(main_layout)
@@ -104,6 +746,15 @@ class MainWindow(QMainWindow):
             self.task_inpt.clear()
             self.task_inpt.setFocus()
 
+    def sort_tasks(self, checked):
+        # Alphabetical while checked, otherwise the order tasks were added in
+        self.proxy.sort(0 if checked else -1)
+
+    def closeEvent(self, event):
+        # Let the writer commit whatever is still queued
+        self.store.close()
+        super().closeEvent(event)
+
        
 
 